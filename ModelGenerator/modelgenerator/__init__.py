@@ -1,7 +1,8 @@
 from modelgenerator.structure import Structure
-from modelgenerator.floor import Floor
-from modelgenerator.frame import Frame
+from modelgenerator.floor import Floor, apply_floor_loads
+from modelgenerator.frame import Frame, frames_in_SFRSbay, end_ordinates
 from modelgenerator.wall import Wall
+from modelgenerator.sapmodel import SapModelCache
 
 __version__ = "0.3.0"
 __author__ = "Robert Wang"
\ No newline at end of file
@@ -1,3 +1,9 @@
+import logging
+from collections import defaultdict
+from modelgenerator.sapmodel import _ok
+
+logger = logging.getLogger(__name__)
+
 
 class Floor:
     """
@@ -12,6 +18,9 @@ class Floor:
         live_load                       float:: live load (ksi)
         section                         str:: floor section assignment
     """
+    __slots__ = ("story", "diaphragm", "z", "vertices", "SD_load", "live_load", "section",
+                 "N_vertices", "unique_name", "_xs", "_ys", "_zs", "area", "polygon")
+    
     def __init__(self, story, diaphragm, z, vertices, SD_load, live_load, section):
         # input args
         self.story = story
@@ -24,26 +33,61 @@ class Floor:
         
         self.N_vertices = len(vertices)     # float:: number of vertices
         self.unique_name = None             # str:: uid per ETABS. Assigned in add_by_coord()
+        self.polygon = None                 # shapely.Polygon:: prepared plan polygon. Assigned by Structure.create_floors()
+        
+        # per-axis vertex coords, built once for the API call
+        self._xs = [v[0] for v in vertices]     # list:: X coord of each vertex
+        self._ys = [v[1] for v in vertices]     # list:: Y coord of each vertex
+        self._zs = [self.z] * self.N_vertices   # list:: Z coord of each vertex
+        
+        # plan area by shoelace formula. Degenerate floors (< 3 vertices or zero area) are never sent to ETABS
+        twice_area = 0.0
+        for k in range(self.N_vertices):
+            twice_area += self._xs[k-1]*self._ys[k] - self._xs[k]*self._ys[k-1]
+        self.area = 0.5*abs(twice_area) if self.N_vertices >= 3 else 0.0    # float:: plan area (in^2)
+        
+        
+    def __setstate__(self, state):
+        """Restore from a pickle written before __slots__, which holds an attribute dict. Only read by update.migrate_pickle()"""
+        self.__init__(state["story"], state["diaphragm"], state["z"], state["vertices"],
+                      state["SD_load"], state["live_load"], state["section"])
+        for k, v in state.items():
+            setattr(self, k, v)
         
         
     def add_by_coord(self, SapModel):
-        """Add floor object to ETABS model"""
+        """Add floor object to ETABS model. Degenerate floors are skipped and keep unique_name = None"""
+        if self.area < 1e-6:
+            self.unique_name = None
+            logger.warning("skipped degenerate floor with zero area: %s", self.story)
+            return
         ret = SapModel.AreaObj.AddByCoord(NumberPoints = self.N_vertices,
-                                          X = [xy[0] for xy in self.vertices],
-                                          Y = [xy[1] for xy in self.vertices],
-                                          Z = [self.z] * self.N_vertices,
+                                          X = self._xs,
+                                          Y = self._ys,
+                                          Z = self._zs,
                                           PropName = self.section)
         self.unique_name = ret[3]
-        if ret[-1] != 0:
-            print(f"WARNING: failed to add floor: {self.story}")
+        if not _ok(ret):
+            logger.warning("failed to add floor: %s", self.story)
+    
+    
+    @classmethod
+    def add_many(cls, SapModel, floors):
+        """
+        Add a batch of floor objects to ETABS. The caller unlocks the model once before adding anything
+        (see run.py), and no view refresh happens until the caller asks for one.
+        Must run on the thread that attached to ETABS; the SapModel proxy is not shareable across threads
+        """
+        for floor_obj in floors:
+            floor_obj.add_by_coord(SapModel)
         
         
     def set_diaphragm(self, SapModel):
         """ Set diaphragm section"""
         ret = SapModel.AreaObj.SetDiaphragm(Name = self.unique_name,
                                             DiaphragmName = self.diaphragm)
-        if ret != 0:
-            print(f"WARNING: failed to set diaphragm for floor: {self.story}")
+        if not _ok(ret):
+            logger.warning("failed to set diaphragm for floor: %s", self.story)
     
     
     def set_loading(self, SapModel):
@@ -53,14 +97,53 @@ class Floor:
                                               LoadPat = "Dead (Superimposed)",
                                               Value = self.SD_load,
                                               Dir = 10)
-        if ret != 0:
-            print(f"WARNING: failed to set SD load for floor: {self.story}")
+        if not _ok(ret):
+            logger.warning("failed to set SD load for floor: %s", self.story)
             
         # live load
         ret = SapModel.AreaObj.SetLoadUniform(Name = self.unique_name,
                                               LoadPat = "Live",
                                               Value = self.live_load,
                                               Dir = 10)
-        if ret != 0:
-            print(f"WARNING: failed to set live load for floor: {self.story}")
-        
\ No newline at end of file
+        if not _ok(ret):
+            logger.warning("failed to set live load for floor: %s", self.story)
+
+
+
+def apply_floor_loads(SapModel, floors):
+    """
+    Apply SD and live load to many floors at once. Floors sharing the same (SD_load, live_load) pair
+    are tagged into a temporary group and each group gets its two SetLoadUniform calls with ItemType=1 (Group)
+    instead of two calls per floor. Temporary groups are removed afterwards; loads stay on the floors
+    """
+    floors_by_load = defaultdict(list)
+    for floor_obj in floors:
+        if floor_obj.unique_name is None:
+            continue
+        floors_by_load[(round(floor_obj.SD_load, 9), round(floor_obj.live_load, 9))].append(floor_obj)
+        
+    for i, ((SD_load, live_load), group_floors) in enumerate(floors_by_load.items()):
+        group_name = f"__floor_load_{i}"
+        ret = SapModel.GroupDef.SetGroup_1(group_name)
+        for floor_obj in group_floors:
+            ret = SapModel.AreaObj.SetGroupAssign(Name = floor_obj.unique_name,
+                                                  GroupName = group_name)
+            
+        # superimposed dead load (Dir=10 is gravity direction)
+        ret = SapModel.AreaObj.SetLoadUniform(Name = group_name,
+                                              LoadPat = "Dead (Superimposed)",
+                                              Value = group_floors[0].SD_load,
+                                              Dir = 10,
+                                              ItemType = 1)
+        if not _ok(ret):
+            logger.warning("failed to set SD load for floors: %s", [f.story for f in group_floors])
+            
+        # live load
+        ret = SapModel.AreaObj.SetLoadUniform(Name = group_name,
+                                              LoadPat = "Live",
+                                              Value = group_floors[0].live_load,
+                                              Dir = 10,
+                                              ItemType = 1)
+        if not _ok(ret):
+            logger.warning("failed to set live load for floors: %s", [f.story for f in group_floors])
+        ret = SapModel.GroupDef.Delete(group_name)
@@ -1,3 +1,9 @@
+import logging
+import numpy as np
+from modelgenerator.sapmodel import _ok
+
+logger = logging.getLogger(__name__)
+
 
 class Frame:
     """
@@ -9,12 +15,29 @@ class Frame:
         section             str:: frame section assignment
         end_coords          list:: xyz tuple of the end coordinates
     """
+    __slots__ = ("frame_type", "story", "section", "end_coords", "_i", "_j",
+                 "_xi", "_yi", "_zi", "_xj", "_yj", "_zj",
+                 "unique_name", "deleted", "is_lateral", "frame_direction")
+    
+    # end release and offset arrays are identical for every frame. Built once here instead of per call
+    _PINNED_II = (False, False, False, True, True, True)
+    _PINNED_JJ = (False, False, False, False, True, True)
+    _FIXED_II = _FIXED_JJ = (False,)*6
+    _ZEROS6 = (0,)*6
+    
+    # bool:: true if this ETABS build needs the double SetEndLengthOffset call. None until probed in set_rigid_end_offset()
+    _rz_quirk_needed = None
+    
     def __init__(self, frame_type, story, section, end_coords):
         # input args
         self.frame_type = frame_type
         self.story = story
         self.section = section
         self.end_coords = end_coords
+        self._i = tuple(end_coords[0])          # tuple:: xyz of the i-end, saves a subscript chain in hot checks
+        self._j = tuple(end_coords[1])          # tuple:: xyz of the j-end
+        self._xi, self._yi, self._zi = self._i  # float:: i-end coords unpacked once for add_by_coord()
+        self._xj, self._yj, self._zj = self._j  # float:: j-end coords unpacked once for add_by_coord()
         
         # other frame attributes (determined later)
         self.unique_name = None                 # str:: uid Assigned when added to ETABS in add_by_coord()
@@ -23,42 +46,86 @@ class Frame:
         self.frame_direction = None             # str:: "X" or "Y" if a lateral member. Else None
         
         
+    def __setstate__(self, state):
+        """Restore from a pickle written before __slots__, which holds an attribute dict. Only read by update.migrate_pickle()"""
+        self.__init__(state["frame_type"], state["story"], state["section"], state["end_coords"])
+        for k, v in state.items():
+            setattr(self, k, v)
+        
+        
     def add_by_coord(self, SapModel):
         """Add frame to ETABS by the end coords"""
-        ret = SapModel.FrameObj.AddByCoord(XI = self.end_coords[0][0],
-                                           YI = self.end_coords[0][1],
-                                           ZI = self.end_coords[0][2],
-                                           XJ = self.end_coords[1][0],
-                                           YJ = self.end_coords[1][1],
-                                           ZJ = self.end_coords[1][2],
+        ret = SapModel.FrameObj.AddByCoord(XI = self._xi,
+                                           YI = self._yi,
+                                           ZI = self._zi,
+                                           XJ = self._xj,
+                                           YJ = self._yj,
+                                           ZJ = self._zj,
                                            PropName = self.section)
         self.unique_name = ret[0]
-        if ret[-1] != 0:
-            print(f"WARNING: failed to add frame with end coord: {self.end_coords}")
+        if not _ok(ret):
+            logger.warning("failed to add frame with end coord: %s", self.end_coords)
+    
+    
+    @classmethod
+    def add_many(cls, SapModel, frames, **kwargs):
+        """
+        Add a batch of frame objects to ETABS. The caller unlocks the model once before adding anything
+        (see run.py), and no view refresh happens until the caller asks for one.
+        Any kwargs are forwarded to materialize() and applied to every frame in the batch.
+        Must run on the thread that attached to ETABS; the SapModel proxy is not shareable across threads
+        """
+        for frame_obj in frames:
+            frame_obj.materialize(SapModel, **kwargs)
+    
+    
+    def materialize(self, SapModel, is_pinned=False, cardinal_pt=None, rigid_end=False, rotate_ang=0.0, new_section=None):
+        """
+        Add frame to ETABS and apply all of its properties in one go. Setters whose value
+        already matches what ETABS assigns to a new frame are skipped:
+            is_pinned=False -> new frames have no releases, SetReleases is not called
+            cardinal_pt=None -> insertion point is left alone (e.g. columns)
+            rotate_ang=0 -> local axes are left alone
+            new_section equal to self.section -> section is left alone
+        """
+        self.add_by_coord(SapModel)
+        if is_pinned:
+            self.set_releases(SapModel, is_pinned=True)
+        if cardinal_pt is not None:
+            self.set_cardinal_point(SapModel, cardinal_pt)
+        if rigid_end:
+            self.set_rigid_end_offset(SapModel)
+        if rotate_ang:
+            self.rotate_axes(SapModel, angle=rotate_ang)
+        if new_section is not None and new_section != self.section:
+            self.change_section(SapModel, new_section)
         
         
     def set_releases(self, SapModel, is_pinned):
         """Set end releases"""
         if is_pinned:
-            II = [False, False, False, True, True, True]
-            JJ = [False, False, False, False, True, True]
+            II = self._PINNED_II
+            JJ = self._PINNED_JJ
         else:
-            II = [False, False, False, False, False, False]
-            JJ = [False, False, False, False, False, False]
+            II = self._FIXED_II
+            JJ = self._FIXED_JJ
             
         ret = SapModel.FrameObj.SetReleases(Name = self.unique_name,
                                             II = II,
                                             JJ = JJ,
-                                            StartValue = [0,0,0,0,0,0],
-                                            EndValue = [0,0,0,0,0,0])
+                                            StartValue = self._ZEROS6,
+                                            EndValue = self._ZEROS6)
         
         # NOTE some BRB elements will automatically be released by ETABS after analysis
-        if ret[-1] != 0:
-            print(f"WARNING: failed to add frame releases for frame: {self.unique_name}")
+        if not _ok(ret):
+            logger.warning("failed to add frame releases for frame: %s", self.unique_name)
         
         
     def set_cardinal_point(self, SapModel, cardinal_pt=8):
         """Set insertion point. ETABS default for beams is 8 - top center. Only called for beams"""
+        # a new horizontal member already sits at top center, nothing to send
+        if cardinal_pt == 8 and self._zi == self._zj:
+            return
         ret = SapModel.FrameObj.SetInsertionPoint_1(Name = self.unique_name,
                                                     CardinalPoint = cardinal_pt,
                                                     Mirror2 = False,
@@ -66,8 +133,8 @@ class Frame:
                                                     StiffTransform = False,
                                                     Offset1 = [0,0,0],
                                                     Offset2 = [0,0,0])
-        if ret[-1] != 0:
-            print(f"WARNING: failed to set insertion point for frame: {self.unique_name}")
+        if not _ok(ret):
+            logger.warning("failed to set insertion point for frame: %s", self.unique_name)
     
     
     def delete(self, SapModel):
@@ -75,27 +142,62 @@ class Frame:
         ret = SapModel.FrameObj.Delete(self.unique_name)
         self.deleted = True
         
-        if ret != 0:
-            print(f"WARNING: Could not find and delete frame: {self.unique_name}")
+        if not _ok(ret):
+            logger.warning("could not find and delete frame: %s", self.unique_name)
+    
+    
+    @classmethod
+    def delete_many(cls, SapModel, frames, group_name="__to_delete"):
+        """
+        Remove a batch of frames from the model. Frames are tagged into a temporary group
+        and the group is deleted with a single FrameObj.Delete call (ItemType=1 is Group)
+        """
+        if len(frames) == 0:
+            return
+        ret = SapModel.GroupDef.SetGroup_1(group_name)
+        for frame_obj in frames:
+            ret = SapModel.FrameObj.SetGroupAssign(Name = frame_obj.unique_name,
+                                                   GroupName = group_name)
+        ret = SapModel.FrameObj.Delete(Name = group_name,
+                                       ItemType = 1)
+        if not _ok(ret):
+            logger.warning("could not delete %s frames in group: %s", len(frames), group_name)
+        ret = SapModel.GroupDef.Delete(group_name)
+        for frame_obj in frames:
+            frame_obj.deleted = True
         
          
     def set_rigid_end_offset(self, SapModel):
         """Set member rigid end offset (usually only for lateral members)"""
-        # NOTE API QUIRK: need to set AutoOffset to False to ingest RZ = 1. Then set it to True again
-        ret = SapModel.FrameObj.SetEndLengthOffset(Name = self.unique_name,
-                                                   AutoOffset = False,
-                                                   Length1 = 0,
-                                                   Length2 = 0,
-                                                   RZ = 1,
-                                                   ItemType = 0)
+        # NOTE API QUIRK: some ETABS builds need AutoOffset set to False to ingest RZ = 1. Then set it to True again.
+        # The first frame probes the build with a single call; the double call is only kept if RZ did not stick
+        if Frame._rz_quirk_needed is None:
+            ret = SapModel.FrameObj.SetEndLengthOffset(Name = self.unique_name,
+                                                       AutoOffset = True,
+                                                       Length1 = 0,
+                                                       Length2 = 0,
+                                                       RZ = 1,
+                                                       ItemType = 0)
+            auto_offset, _, _, rz, ret_get = SapModel.FrameObj.GetEndLengthOffset(self.unique_name)
+            Frame._rz_quirk_needed = not (_ok(ret) and ret_get == 0 and auto_offset and rz == 1)
+            if not Frame._rz_quirk_needed:
+                return
+        
+        if Frame._rz_quirk_needed:
+            ret = SapModel.FrameObj.SetEndLengthOffset(Name = self.unique_name,
+                                                       AutoOffset = False,
+                                                       Length1 = 0,
+                                                       Length2 = 0,
+                                                       RZ = 1,
+                                                       ItemType = 0)
         ret = SapModel.FrameObj.SetEndLengthOffset(Name = self.unique_name,
                                                    AutoOffset = True,
                                                    Length1 = 0,
                                                    Length2 = 0,
                                                    RZ = 1,
                                                    ItemType = 0)
-        if ret != 0:
-            print(f"WARNING: could not set rigid end zone factor for frame: {self.unique_name}")
+        if not _ok(ret):
+            logger.warning("could not set rigid end zone factor for frame: %s", self.unique_name)
     
     
     def rotate_axes(self, SapModel, angle):
@@ -103,49 +205,44 @@ class Frame:
         ret = SapModel.FrameObj.SetLocalAxes(Name = self.unique_name,
                                              Ang = angle,
                                              ItemType = 0)
-        if ret != 0:
-            print(f"WARNING: could not rotate local axes for frame: {self.unique_name}")
+        if not _ok(ret):
+            logger.warning("could not rotate local axes for frame: %s", self.unique_name)
     
     
     def change_section(self, SapModel, section):
         """Mostly used to change to SFRS section"""
         ret = SapModel.FrameObj.SetSection(Name = self.unique_name,
                                            PropName = section)
-        if ret != 0:
-            print(f"WARNING: could not change section for frame: {self.unique_name}")
+        if not _ok(ret):
+            logger.warning("could not change section for frame: %s", self.unique_name)
     
     
     def check_in_SFRSbay(self, frame_direction, ordinate_from, ordinate_to):
         """
         Check if this frame is in SFRS bay given a start-end ordinate and a frame direction
         """
-        if frame_direction == "X":
-            i_inbay = self.end_coords[0][0]>=ordinate_from and self.end_coords[0][0]<=ordinate_to
-            j_inbay = self.end_coords[1][0]>=ordinate_from and self.end_coords[1][0]<=ordinate_to
-        else:
-            i_inbay = self.end_coords[0][1]>=ordinate_from and self.end_coords[0][1]<=ordinate_to
-            j_inbay = self.end_coords[1][1]>=ordinate_from and self.end_coords[1][1]<=ordinate_to
-            
-        inbay = i_inbay and j_inbay
-        return inbay
-    
-    
+        idx = 0 if frame_direction == "X" else 1
+        vi = self._i[idx]
+        vj = self._j[idx]
+        return ordinate_from<=vi<=ordinate_to and ordinate_from<=vj<=ordinate_to
 
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
-    
\ No newline at end of file
+
+
+def end_ordinates(frames, frame_direction):
+    """
+    (M,2) array of the i-end and j-end ordinate of each frame along frame_direction ("X" or "Y")
+    """
+    axis = 0 if frame_direction == "X" else 1
+    ends = np.fromiter((v for f in frames for v in (f._i[axis], f._j[axis])), dtype=float, count=2*len(frames))
+    return ends.reshape(-1, 2)
+
+
+
+def frames_in_SFRSbay(frames, frame_direction, ordinate_from, ordinate_to, ordinates=None):
+    """
+    Vectorized Frame.check_in_SFRSbay over a list of frames. Returns a boolean array, one entry per frame.
+    ordinates from end_ordinates() can be passed in to reuse them across several bays on the same frames
+    """
+    if ordinates is None:
+        ordinates = end_ordinates(frames, frame_direction)
+    return ((ordinates >= ordinate_from) & (ordinates <= ordinate_to)).all(axis=1)
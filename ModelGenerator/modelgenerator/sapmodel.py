@@ -0,0 +1,30 @@
+def _ok(ret):
+    """
+    True if an ETABS API call succeeded. Calls with output args return a list whose last item is the
+    return code, calls without return the code directly
+    """
+    return (ret if isinstance(ret, int) else ret[-1]) == 0
+
+
+
+class SapModelCache:
+    """
+    Thin wrapper around the ETABS SapModel COM object. Every SapModel.FrameObj, SapModel.AreaObj, etc.
+    is a COM property get that hands back a fresh interface pointer, so each sub-interface is resolved
+    once on first use and reused for every call after that. Sub-interfaces are wrapped the same way, so
+    hot methods such as SapModel.FrameObj.AddByCoord resolve to one cached bound method.
+    
+    Args:
+        SapModel                        COM object:: SapModel from the attached ETABS instance
+    """
+    def __init__(self, SapModel):
+        self._SapModel = SapModel
+        
+        
+    def __getattr__(self, name):
+        # only called on a cache miss. Store the resolved attribute so the next lookup is a plain dict hit
+        attr = getattr(self._SapModel, name)
+        if not callable(attr):
+            attr = SapModelCache(attr)      # sub-interface (FrameObj, AreaObj, ...). Cache its methods too
+        setattr(self, name, attr)
+        return attr
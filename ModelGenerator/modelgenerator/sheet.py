@@ -0,0 +1,49 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+def cell_block(raw, address, origin):
+    """
+    Slice the cells at an A1 address (e.g. "T38:W73") out of raw, the 2D list read from the range starting at origin
+    (e.g. "C8:AU79" or "A1")
+    """
+    def row_col(cell):
+        letters, digits = re.fullmatch(r"([A-Z]+)(\d+)", cell).groups()
+        col = 0
+        for letter in letters:
+            col = col*26 + ord(letter) - ord("A") + 1
+        return int(digits), col
+    
+    row0, col0 = row_col(origin.split(":")[0])
+    (r1, c1), (r2, c2) = [row_col(cell) for cell in address.split(":")]
+    return [row[c1-col0:c2-col0+1] for row in raw[r1-row0:r2-row0+1]]
+
+
+
+def filled_table(block, headers, drop_empty_columns=False, any_cell=False):
+    """
+    DataFrame of the rows in block (2D list from cell_block) whose first cell is filled, or with any_cell any of its
+    cells. Rows keep their position in the block as index, so they still line up with floors. Blank rows and, if
+    asked, blank columns are dropped in plain Python before the DataFrame is built. Returns None if every row is blank
+    """
+    if any_cell:
+        rows = [i for i, row in enumerate(block) if any(not pd.isna(v) for v in row)]
+    else:
+        rows = [i for i, row in enumerate(block) if not pd.isna(row[0])]
+    if len(rows) == 0:
+        return None
+    cols = range(len(headers))
+    if drop_empty_columns:
+        cols = [j for j in cols if any(not pd.isna(block[i][j]) for i in rows)]
+    return pd.DataFrame([[block[i][j] for j in cols] for i in rows], columns=[headers[j] for j in cols], index=rows)
+
+
+
+def grid_ordinates(block):
+    """
+    {grid name: ordinate} for the filled rows of a grid table (2D list from cell_block). Ordinates go from ft to in
+    """
+    rows = [(str(k), v) for k,v in block if not pd.isna(v)]
+    ordinates = np.asarray([v for _,v in rows], dtype=float) * 12
+    return dict(zip([k for k,_ in rows], ordinates.tolist()))
@@ -1,9 +1,68 @@
+import csv
+import io
+import re
 import pandas as pd
 import modelgenerator
 import shapely
 import numpy as np
+from collections import defaultdict, namedtuple
+from functools import partial
 from tqdm import tqdm
 
+# one parsed SFRS bay. See Structure._parse_sfrs_bays()
+_SFRSBay = namedtuple("_SFRSBay", ["col", "label", "grid_on", "grid_from", "grid_to",
+                                   "direction", "abscissa", "ordinate_from", "ordinate_to", "ordinate_range"])
+
+_VERTEX_RE = re.compile(r"\(\s*([-+\d.eE]+)\s*,\s*([-+\d.eE]+)\s*\)")
+
+
+def _point_builder(direction, abscissa):
+    """
+    Return a function (ordinate, z) --> (x, y, z) for points on the grid line at abscissa, so members
+    along that line are built the same way in either direction
+    """
+    if direction == "X":
+        return lambda ordinate, z: (ordinate, abscissa, z)
+    return lambda ordinate, z: (abscissa, ordinate, z)
+
+
+def _bay_segments(ordinate_range):
+    """
+    (start, end, midpoint) ordinates of each segment between consecutive grids of a bay, computed for the
+    whole bay at once with numpy
+    """
+    ords = np.asarray(ordinate_range, dtype=float)
+    starts, ends = ords[:-1], ords[1:]
+    return zip(starts.tolist(), ends.tolist(), ((starts + ends)/2).tolist())
+
+
+_START, _END, _MID = 0, 1, 2     # ordinate columns of each bay segment in _brace_coords()
+
+
+def _brace_coords(direction, abscissa, ordinate_range, ordinates, zs):
+    """
+    End coords of every brace in a bay as an (N*M, 2, 3) array, segment by segment. Each of the M members per
+    segment is given by the ordinates of its two ends as _START/_END/_MID and the z of its two ends
+    """
+    ords = np.asarray(ordinate_range, dtype=float)
+    starts, ends = ords[:-1], ords[1:]
+    segments = np.stack([starts, ends, (starts + ends)/2], axis=1)     # (N,3) start, end, midpoint
+    
+    ord_axis = 0 if direction == "X" else 1
+    coords = np.empty((len(segments), len(zs), 2, 3))
+    coords[..., 1 - ord_axis] = abscissa
+    coords[..., ord_axis] = segments[:, ordinates]
+    coords[..., 2] = zs
+    return coords.reshape(-1, 2, 3)
+
+
+def _parse_polygon(polygon_str):
+    """
+    Parse a floor polygon string such as "(0,0);(37,0);(37,26);(0,26)" into an (N,2) float array
+    of vertices (last point does not repeat first)
+    """
+    return np.asarray(_VERTEX_RE.findall(polygon_str), dtype=float).reshape(-1, 2)
+
 
 class Structure:
     """
@@ -47,6 +106,13 @@ class Structure:
                 ...["n_infill"] = 0 to 4
             
     """
+    # frame categories update.py resizes, in the order their sections are applied (SFRS after gravity).
+    # set_groups() gives each (floor, category) its own ETABS group, see section_group()
+    SECTION_CATEGORIES = ("column", "girder", "beam",
+                          "SFRS_beamX", "SFRS_beamY", "SFRS_columnX", "SFRS_columnY",
+                          "SFRS_braceX", "SFRS_braceY")
+    WALL_CATEGORIES = ("SFRS_wallX", "SFRS_wallY")
+    
     def __init__(self, df_floors, x_grids, y_grids, df_SFRSbays, df_MF, df_braces, df_walls, df_walls_openings, model_options):
         # input args
         self.df_floors = df_floors
@@ -74,56 +140,65 @@ class Structure:
         self.index_for = None               # dict:: storing list of frame id that's relevant to a group, such as on the same grid line, etc
         self.index_for_walls = None         # dict:: same thing as above. Walls uniquename may overlap with frames so it is stored separately.
         
+        # SFRS
+        self.sfrs_bays = None               # list:: parsed SFRS bays for each floor from roof to base. Built in add_SFRS()
+        
         
     def init_index_groups(self):
         """
-        Initialize keys for self.index_for dictionary. Keys include:
-        The index_for dictionary will return a list of uniqueNames that satisfy a given condition.
+        Initialize the self.index_for dictionaries. Each one returns a list of uniqueNames that satisfy a given condition.
+        Keys are created on first use, e.g.:
+            "column", "girder", "beam", "deleted", "SFRS", "SFRS_beamX", "SFRS_columnY", "SFRS_braceX", ...
+            f"{floor_name}", f"on {grid}"
+        A key that was never filled returns an empty list.
         """
         # frame members
-        self.index_for = dict()
-        self.index_for["column"] = []
-        self.index_for["girder"] = []
-        self.index_for["beam"] = []
-        self.index_for["SFRS"] = []
-        self.index_for["SFRS_beamX"] = []
-        self.index_for["SFRS_beamY"] = []
-        self.index_for["SFRS_columnX"] = []
-        self.index_for["SFRS_columnY"] = []
-        self.index_for["SFRS_braceX"] = []
-        self.index_for["SFRS_braceY"] = []
-        self.index_for["deleted"] = []
-        for floor in self.floor_names:
-            self.index_for[f"{floor}"] = []
-        for xgrid in self.x_grids.keys():
-            self.index_for[f"on {xgrid}"] = []
-        for ygrid in self.y_grids.keys():
-            self.index_for[f"on {ygrid}"] = []
+        self.index_for = defaultdict(list)
             
         # area objects can have same uniqueName as frame. Cannot keep in same set
-        self.index_for_walls = dict()
-        self.index_for_walls["SFRS_wallX"] = []
-        self.index_for_walls["SFRS_wallY"] = []
-        for floor in self.floor_names:
-            self.index_for_walls[f"{floor}"] = []
-        for xgrid in self.x_grids.keys():
-            self.index_for_walls[f"on {xgrid}"] = []
-        for ygrid in self.y_grids.keys():
-            self.index_for_walls[f"on {ygrid}"] = []
+        self.index_for_walls = defaultdict(list)
             
         # Wall Openings
-        self.index_for_walls_opening = dict()
-        self.index_for_walls_opening["SFRS_wall_openingX"] = []
-        self.index_for_walls_opening["SFRS_wall_openingY"] = []
-        for floor in self.floor_names:
-            self.index_for_walls_opening[f"{floor}"] = []
-        for xgrid in self.x_grids.keys():
-            self.index_for_walls_opening[f"on {xgrid}"] = []
-        for ygrid in self.y_grids.keys():
-            self.index_for_walls_opening[f"on {ygrid}"] = []
+        self.index_for_walls_opening = defaultdict(list)
+        
+        
+    def __setstate__(self, state):
+        """
+        Restore from a pickle written by older versions, which update.py converts to JSON once. Index groups go back to
+        defaultdicts so missing keys read as empty lists
+        """
+        self.__dict__.update(state)
+        self.__dict__.setdefault("sfrs_bays", None)
+        for k in ("index_for", "index_for_walls", "index_for_walls_opening"):
+            if self.__dict__.get(k) is not None:
+                setattr(self, k, defaultdict(list, self.__dict__[k]))
         
         
+    def to_dict(self):
+        """
+        Plain data needed to update a generated model (floor names and index groups), safe to write as JSON. Dicts
+        keyed by floor name are stored as [key, value] pairs so numeric floor names keep their type. Sections applied
+        by update.py are saved separately by update.py
+        """
+        return {"floor_names": self.floor_names,
+                "index_for": [[k, v] for k, v in self.index_for.items()],
+                "index_for_walls": [[k, v] for k, v in self.index_for_walls.items()],
+                "index_for_walls_opening": [[k, v] for k, v in self.index_for_walls_opening.items()]}
+    
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a Structure from to_dict(). Only the floor names and index groups are restored; inputs, floor and
+        frame objects are left as None
+        """
+        structure = cls(*[None]*9)
+        structure.floor_names = data["floor_names"]
+        for k in ("index_for", "index_for_walls", "index_for_walls_opening"):
+            setattr(structure, k, defaultdict(list, {key: uids for key, uids in data[k]}))
+        return structure
         
+    
     def create_grids(self, SapModel):
         """
         ETABS API currently cannot change grids. Need to use interactive database. 
@@ -136,44 +211,28 @@ class Structure:
                 Bubble Location = "End" or "Start"
                 Visible = True or False
         """
-        # create a dataframe for csv conversion
-        df_dict = {"Name" : [],
-                   "Grid Line Type" : [],
-                   "ID" : [],
-                   "Ordinate" : [],
-                   "Angle" : [],
-                   "X1" : [],
-                   "Y1" : [],
-                   "X2" : [],
-                   "Y2" : [],
-                   "Bubble Location" : [],
-                   "Visible" : []}
-        for k,v in self.x_grids.items():
-            df_dict["Grid Line Type"].append("Y (Cartesian)")
-            df_dict["ID"].append(k)
-            df_dict["Ordinate"].append(v)
-            df_dict["Bubble Location"].append("Start")
-            df_dict["Name"].append("G1")
-            df_dict["Angle"].append(None)
-            df_dict["X1"].append(None)
-            df_dict["Y1"].append(None)
-            df_dict["X2"].append(None)
-            df_dict["Y2"].append(None)
-            df_dict["Visible"].append(True)
-        for k,v in self.y_grids.items():
-            df_dict["Grid Line Type"].append("X (Cartesian)")
-            df_dict["ID"].append(k)
-            df_dict["Ordinate"].append(v)
-            df_dict["Bubble Location"].append("Start")
-            df_dict["Name"].append("G1")
-            df_dict["Angle"].append(None)
-            df_dict["X1"].append(None)
-            df_dict["Y1"].append(None)
-            df_dict["X2"].append(None)
-            df_dict["Y2"].append(None)
-            df_dict["Visible"].append(True)
-        grids_df = pd.DataFrame(df_dict)
-        grids_csv = grids_df.to_csv(index=False)
+        # columns for csv conversion. Each column is built whole, X grids first then Y grids
+        n_x = len(self.x_grids)
+        n_y = len(self.y_grids)
+        n = n_x + n_y
+        df_dict = {"Name" : ["G1"]*n,
+                   "Grid Line Type" : ["Y (Cartesian)"]*n_x + ["X (Cartesian)"]*n_y,
+                   "ID" : list(self.x_grids) + list(self.y_grids),
+                   "Ordinate" : [float(v) for v in list(self.x_grids.values()) + list(self.y_grids.values())],
+                   "Angle" : [None]*n,
+                   "X1" : [None]*n,
+                   "Y1" : [None]*n,
+                   "X2" : [None]*n,
+                   "Y2" : [None]*n,
+                   "Bubble Location" : ["Start"]*n,
+                   "Visible" : [True]*n}
+        
+        # small all-scalar table, write it straight to a string buffer instead of going through DataFrame.to_csv
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(df_dict.keys())
+        writer.writerows(zip(*df_dict.values()))
+        grids_csv = buffer.getvalue()
         
         # push grids to ETABS using interactive database
         table_version, csv_str, ret = SapModel.DatabaseTables.GetTableForEditingCSVString("Grid Definitions - Grid Lines", None)
@@ -195,13 +254,14 @@ class Structure:
         Generate story elevation definition using SapModel.Story.SetStories_2
         """
         n_stories = len(self.df_floors)
-        self.floor_names = list(self.df_floors["floor_name"])
-        self.floor_height = [x*12 for x in list(self.df_floors["floor_height"])]
-        self.floor_z = [x*12 for x in list(self.df_floors["floor_elev"])]
+        floor_height = self.df_floors["floor_height"].to_numpy() * 12
+        self.floor_names = self.df_floors["floor_name"].tolist()
+        self.floor_height = floor_height.tolist()
+        self.floor_z = (self.df_floors["floor_elev"].to_numpy() * 12).tolist()
         
         # API expects stories to be passed base to roof. need to reversed with [::-1]
         story_names = self.floor_names[::-1] 
-        story_height = self.floor_height[::-1]
+        story_height = floor_height[::-1].tolist()
         
         # inject into ETABS
         ret = SapModel.Story.SetStories_2(BaseElevation = 0,
@@ -230,25 +290,18 @@ class Structure:
             z = self.df_floors.loc[i, "floor_elev"] * 12
             
             # parse vertices from str to list of tuples (last point does not repeat first)
-            # e.g. "(0,0);(37,0);(37,26);(0,26)" --> remove spaces --> split by ; then for each element:
-            # e.g. "(37,0)" --> split by comma --> x coord remove "(" --> y coord remove ")"
-            vertices = []
-            all_vertices_str = self.df_floors.loc[i, "floor_polygon"]
-            all_vertices_str = all_vertices_str.replace(" ","")
-            for vertex_str in all_vertices_str.split(";"):
-                x_str = vertex_str.split(",")[0]
-                x_str = x_str.strip("(")
-                y_str = vertex_str.split(",")[1]
-                y_str = y_str.strip(")")
-                vertices.append((float(x_str), float(y_str)))
+            # e.g. "(0,0);(37,0);(37,26);(0,26)" --> [(0.0,0.0), (37.0,0.0), (37.0,26.0), (0.0,26.0)]
+            vertices_arr = _parse_polygon(self.df_floors.loc[i, "floor_polygon"])
+            vertices = [tuple(v) for v in vertices_arr.tolist()]
             
-            # calculate area and perimeter
-            floor_polygon = shapely.Polygon(vertices)
+            # calculate area and perimeter. Polygon is prepared once here and reused by delete_frames
+            floor_polygon = shapely.Polygon(vertices_arr)
+            shapely.prepare(floor_polygon)
             area = floor_polygon.area
             perimeter = floor_polygon.length
             
             # add cladding load (lbs/ft to SDL psf)
-            cladding_psf = (cladding_load * perimeter) / area
+            cladding_psf = (cladding_load * perimeter) / area if area > 0 else 0.0
             
             # create floor objects
             floor_obj = modelgenerator.Floor(story = floor_name, 
@@ -258,12 +311,16 @@ class Structure:
                                              SD_load = sd_load + cladding_psf, 
                                              live_load = live_load, 
                                              section = section)
-            # apply properties
-            floor_obj.add_by_coord(SapModel)
-            floor_obj.set_diaphragm(SapModel)
-            floor_obj.set_loading(SapModel)
+            floor_obj.polygon = floor_polygon
             self.floor_objects[floor_name] = floor_obj
         
+        # push all floors to ETABS in one batch, then apply properties
+        modelgenerator.Floor.add_many(SapModel, self.floor_objects.values())
+        for floor_obj in self.floor_objects.values():
+            if floor_obj.unique_name is not None:
+                floor_obj.set_diaphragm(SapModel)
+        modelgenerator.apply_floor_loads(SapModel, self.floor_objects.values())
+        
         
     def create_frames(self, SapModel):
         """
@@ -272,93 +329,103 @@ class Structure:
         # initialize groups to store frame element uids
         self.init_index_groups()
         
+        # plan layout is identical on every floor. Work out all column/girder/beam ordinates once with numpy
+        # (y_grids are lettered lines at an X ordinate, x_grids are numbered lines at a Y ordinate)
+        # grids are carried as their index_for keys ("on 1", "on A", ...) so no key is formatted per member
+        xgrid_keys = np.array([f"on {grid}" for grid in self.x_grids], dtype=object)
+        ygrid_keys = np.array([f"on {grid}" for grid in self.y_grids], dtype=object)
+        xs = np.fromiter(self.y_grids.values(), dtype=float)
+        ys = np.fromiter(self.x_grids.values(), dtype=float)
+        n_xs, n_ys = len(xs), len(ys)
+        
+        # columns at every grid intersection: lettered grid outer, numbered grid inner
+        col_x, col_y = np.meshgrid(xs, ys, indexing="ij")
+        column_plan = list(zip(col_x.ravel().tolist(), col_y.ravel().tolist(),
+                               np.tile(xgrid_keys, n_xs), np.repeat(ygrid_keys, n_ys)))
+        
+        # X girders along each numbered grid, one per bay between lettered grids
+        gir_y, gir_x_start = np.meshgrid(ys, xs[:-1], indexing="ij")
+        _, gir_x_end = np.meshgrid(ys, xs[1:], indexing="ij")
+        girder_plan = list(zip(gir_x_start.ravel().tolist(), gir_x_end.ravel().tolist(), gir_y.ravel().tolist(),
+                               np.repeat(xgrid_keys, max(n_xs-1, 0))))
+        
+        # Y girders along each lettered grid, one per bay between numbered grids
+        bm_x, bm_y_start = np.meshgrid(xs, ys[:-1], indexing="ij")
+        _, bm_y_end = np.meshgrid(xs, ys[1:], indexing="ij")
+        beam_plan = list(zip(bm_x.ravel().tolist(), bm_y_start.ravel().tolist(), bm_y_end.ravel().tolist(),
+                             np.repeat(ygrid_keys, max(n_ys-1, 0))))
+        
+        # Y infill beams: n_infill evenly spaced lines per bay, over every (X bay, Y bay) pair
+        n_infill = self.model_options["n_infill"]
+        infill_x = xs[:-1, None] + (np.arange(1, n_infill+1) * np.diff(xs)[:, None]) / (n_infill+1)
+        shape = (max(n_xs-1, 0), max(n_ys-1, 0), n_infill)
+        inf_x = np.broadcast_to(infill_x[:, None, :], shape)
+        inf_y_start = np.broadcast_to(ys[None, :-1, None], shape)
+        inf_y_end = np.broadcast_to(ys[None, 1:, None], shape)
+        infill_plan = list(zip(inf_x.ravel().tolist(), inf_y_start.ravel().tolist(), inf_y_end.ravel().tolist()))
+        
+        # index lists are bound once here and per floor below, so members are staged with the lists they go
+        # into and recording a uid is a plain append instead of a dict lookup per group
+        index_for = self.index_for
+        column_list, girder_list, beam_list = index_for["column"], index_for["girder"], index_for["beam"]
+        grid_lists = {key: index_for[key] for key in list(xgrid_keys) + list(ygrid_keys)}
+        
         # generate elements floor by floor from roof to base
         frame_list = []
-        for idx in tqdm(range(len(self.df_floors))):
-            floor_name = self.df_floors.loc[idx, "floor_name"]
-            col_section = self.df_floors.loc[idx, "column"]
-            girder_section = self.df_floors.loc[idx, "girder"]
-            bm_section = self.df_floors.loc[idx, "beam"]
-            z_current = self.df_floors.loc[idx, "floor_elev"] * 12
-            z_below = z_current - self.df_floors.loc[idx, "floor_height"] * 12
-            tqdm.write(f"\t {floor_name}")
+        pbar = tqdm(self.df_floors.itertuples(index=False), total=len(self.df_floors))
+        for floor_row in pbar:
+            floor_name = floor_row.floor_name
+            pbar.set_description(floor_name)
+            col_section = floor_row.column
+            girder_section = floor_row.girder
+            bm_section = floor_row.beam
+            z_current = floor_row.floor_elev * 12
+            z_below = z_current - floor_row.floor_height * 12
+            
+            # stage frame objects for this floor along with the index lists each one belongs to
+            floor_list = index_for[floor_name]
+            columns = []                        # list:: (frame_obj, (index_for lists))
+            beams = []                          # list:: (frame_obj, (index_for lists)). Girders and beams, all pinned
             
             # columns
-            for ygrid,x in self.y_grids.items():
-                for xgrid,y in self.x_grids.items():
-                    frame_obj = modelgenerator.Frame(frame_type = "column", 
-                                                     story = floor_name, 
-                                                     section = col_section, 
-                                                     end_coords = [(x,y,z_below), (x,y,z_current)])
-                    frame_obj.add_by_coord(SapModel)
-                    frame_list.append(frame_obj)
-                    self.index_for["column"].append(frame_obj.unique_name)
-                    self.index_for[f"{floor_name}"].append(frame_obj.unique_name)
-                    self.index_for[f"on {xgrid}"].append(frame_obj.unique_name)
-                    self.index_for[f"on {ygrid}"].append(frame_obj.unique_name)
+            for x, y, xgrid_key, ygrid_key in column_plan:
+                frame_obj = modelgenerator.Frame(frame_type = "column", 
+                                                 story = floor_name, 
+                                                 section = col_section, 
+                                                 end_coords = [(x,y,z_below), (x,y,z_current)])
+                columns.append((frame_obj, (column_list, floor_list, grid_lists[xgrid_key], grid_lists[ygrid_key])))
             
             # X girders
-            xgrid_items = list(self.x_grids.items())
-            ygrid_items = list(self.y_grids.items())
-            for i in range(len(xgrid_items)):
-                for j in range(len(ygrid_items)-1):
-                    xgrid, y = xgrid_items[i]
-                    _, x_start = ygrid_items[j]
-                    _, x_end = ygrid_items[j+1]
-                    frame_obj = modelgenerator.Frame(frame_type = "girder", 
-                                                     story = floor_name, 
-                                                     section = girder_section, 
-                                                     end_coords = [(x_start,y,z_current), (x_end,y,z_current)])
-                    frame_obj.add_by_coord(SapModel)
-                    frame_obj.set_releases(SapModel, is_pinned=True)
-                    frame_obj.set_cardinal_point(SapModel)
-                    frame_list.append(frame_obj)
-                    self.index_for["girder"].append(frame_obj.unique_name)
-                    self.index_for[f"{floor_name}"].append(frame_obj.unique_name)
-                    self.index_for[f"on {xgrid}"].append(frame_obj.unique_name)
+            for x_start, x_end, y, xgrid_key in girder_plan:
+                frame_obj = modelgenerator.Frame(frame_type = "girder", 
+                                                 story = floor_name, 
+                                                 section = girder_section, 
+                                                 end_coords = [(x_start,y,z_current), (x_end,y,z_current)])
+                beams.append((frame_obj, (girder_list, floor_list, grid_lists[xgrid_key])))
                     
             # Y girders (size will actually be infill beam)
-            for i in range(len(ygrid_items)):
-                for j in range(len(xgrid_items)-1):
-                    ygrid, x = ygrid_items[i]
-                    _, y_start = xgrid_items[j]
-                    _, y_end = xgrid_items[j+1]
-                    frame_obj = modelgenerator.Frame(frame_type = "beam", 
-                                                     story = floor_name, 
-                                                     section = bm_section, 
-                                                     end_coords = [(x,y_start,z_current), (x,y_end,z_current)])
-                    frame_obj.add_by_coord(SapModel)
-                    frame_obj.set_releases(SapModel, is_pinned=True)
-                    frame_obj.set_cardinal_point(SapModel)
-                    frame_list.append(frame_obj)
-                    self.index_for["beam"].append(frame_obj.unique_name)
-                    self.index_for[f"{floor_name}"].append(frame_obj.unique_name)
-                    self.index_for[f"on {ygrid}"].append(frame_obj.unique_name)
+            for x, y_start, y_end, ygrid_key in beam_plan:
+                frame_obj = modelgenerator.Frame(frame_type = "beam", 
+                                                 story = floor_name, 
+                                                 section = bm_section, 
+                                                 end_coords = [(x,y_start,z_current), (x,y_end,z_current)])
+                beams.append((frame_obj, (beam_list, floor_list, grid_lists[ygrid_key])))
             
             # Y infill beams
-            for i in range(len(ygrid_items)-1):
-                for j in range(len(xgrid_items)-1):
-                    for k in range(self.model_options["n_infill"]):
-                        _, x_left = ygrid_items[i]
-                        _, x_right = ygrid_items[i+1]
-                        _, y_start = xgrid_items[j]
-                        _, y_end = xgrid_items[j+1]
-                        
-                        bay_width = x_right - x_left
-                        x = x_left + (k+1)*(bay_width) / (self.model_options["n_infill"]+1)
-                        
-                        frame_obj = modelgenerator.Frame(frame_type = "beam", 
-                                                         story = floor_name, 
-                                                         section = bm_section, 
-                                                         end_coords = [(x,y_start,z_current), (x,y_end,z_current)])
-                        frame_obj.add_by_coord(SapModel)
-                        frame_obj.set_releases(SapModel, is_pinned=True)
-                        frame_obj.set_cardinal_point(SapModel)
-                        frame_list.append(frame_obj)
-                        self.index_for["beam"].append(frame_obj.unique_name)
-                        self.index_for[f"{floor_name}"].append(frame_obj.unique_name)
-                        
-            SapModel.View.RefreshView()
+            for x, y_start, y_end in infill_plan:
+                frame_obj = modelgenerator.Frame(frame_type = "beam", 
+                                                 story = floor_name, 
+                                                 section = bm_section, 
+                                                 end_coords = [(x,y_start,z_current), (x,y_end,z_current)])
+                beams.append((frame_obj, (beam_list, floor_list)))
+            
+            # push the whole floor to ETABS in one batch per member type, then record uids
+            modelgenerator.Frame.add_many(SapModel, [frame_obj for frame_obj, _ in columns])
+            modelgenerator.Frame.add_many(SapModel, [frame_obj for frame_obj, _ in beams], is_pinned=True, cardinal_pt=8)
+            for frame_obj, index_lists in columns + beams:
+                frame_list.append(frame_obj)
+                for index_list in index_lists:
+                    index_list.append(frame_obj.unique_name)
                         
         # store all frame objects in a dict
         self.frame_objects = dict()
@@ -370,30 +437,45 @@ class Structure:
         """
         Using shapely, delete all elements on each floor that falls outside of slab polygon
         """
-        # loop through floors from roof to base (serial run)
-        for i in tqdm(range(len(self.floor_names))):
-            floor_name = self.floor_names[i]
-            tqdm.write(f"\t {floor_name}")
-            
-            # create floor polygon
-            floor_polygon = shapely.Polygon(self.floor_objects[floor_name].vertices)
+        # gather every member from roof to base, each paired with its floor polygon
+        relevant_idx = []
+        floor_polygons = []
+        N_members = []
+        for floor_name in self.floor_names:
+            # floor polygon cached by create_floors
+            floor_polygon = self.floor_objects[floor_name].polygon
             shapely.prepare(floor_polygon)
-            
-            # relevant frame members 
-            relevant_idx = self.index_for[floor_name]
-            for idx in relevant_idx:
-                frame_obj = self.frame_objects[idx]
-                vertices = [(a[0],a[1]) for a in frame_obj.end_coords]
-                line = shapely.LineString(vertices)
-                if not floor_polygon.covers(line):
-                    frame_obj.delete(SapModel)
-                    self.index_for["deleted"].append(idx)
-            SapModel.View.RefreshView()
-        
-        # remove deleted indices from other groups
-        self.index_for["column"] = list(set(self.index_for["column"]) - set(self.index_for["deleted"]))
-        self.index_for["girder"] = list(set(self.index_for["girder"]) - set(self.index_for["deleted"]))
-        self.index_for["beam"] = list(set(self.index_for["beam"]) - set(self.index_for["deleted"]))
+            relevant_idx.extend(self.index_for[floor_name])
+            floor_polygons.append(floor_polygon)
+            N_members.append(len(self.index_for[floor_name]))
+        
+        # plan projection of every member as an (M,2,2) array of end points
+        relevant_frames = [self.frame_objects[idx] for idx in relevant_idx]
+        end_points = np.array([(f._i[:2], f._j[:2]) for f in relevant_frames], dtype=float).reshape(-1, 2, 2)
+        
+        # bounding box pass first: a member with an end outside its floor's bbox is outside the floor, and on
+        # rectangular floors (polygon is exactly its bbox) a member inside the bbox is inside the floor. Only the
+        # remaining members of non-rectangular floors go through the exact covers test
+        floor_polygons = np.array(floor_polygons, dtype=object)
+        floor_bounds = shapely.bounds(floor_polygons)
+        is_box = shapely.equals(floor_polygons, shapely.box(*floor_bounds.T))
+        member_bounds = np.repeat(floor_bounds, N_members, axis=0)
+        in_bbox = ((end_points >= member_bounds[:, None, :2]) & (end_points <= member_bounds[:, None, 2:])).all(axis=(1, 2))
+        outside = ~in_bbox
+        exact_idx = np.flatnonzero(in_bbox & ~np.repeat(is_box, N_members))
+        outside[exact_idx] = ~shapely.covers(np.repeat(floor_polygons, N_members)[exact_idx],
+                                             shapely.linestrings(end_points[exact_idx]))
+        outside_idx = np.flatnonzero(outside)
+        frames_to_delete = [relevant_frames[k] for k in outside_idx]
+        self.index_for["deleted"].extend(relevant_idx[k] for k in outside_idx)
+        
+        # delete everything outside of the floor boundaries in one batch
+        modelgenerator.Frame.delete_many(SapModel, frames_to_delete)
+        
+        # remove deleted indices from other groups. delete_many flags each frame, so filter on that flag
+        # instead of rebuilding a set difference per group (also keeps the original creation order)
+        for category in ("column", "girder", "beam"):
+            self.index_for[category] = [idx for idx in self.index_for[category] if not self.frame_objects[idx].deleted]
         
         
     def add_SFRS(self, SapModel):
@@ -403,6 +485,8 @@ class Structure:
             self.add_braces()
             self.add_walls()
         """
+        self.sfrs_bays = self._parse_sfrs_bays()
+        
         if self.df_MF is not None:
             print("\t Adding moment frames")
             self.add_MFs(SapModel)
@@ -417,94 +501,139 @@ class Structure:
             
     
         
+    def _parse_sfrs_bays(self):
+        """
+        Parse every SFRS bay string in df_SFRSbays once, for add_MFs, add_braces and add_walls to share.
+        Returns one list per floor (roof to base) of _SFRSBay tuples:
+            col                 int:: bay column index in df_SFRSbays, not counting floor_name
+            label               str:: raw bay string (e.g. "1;B-E")
+            grid_on             str:: grid the bay lies on (e.g. "1")
+            grid_from, grid_to  str:: grids bounding the bay (e.g. "B", "E")
+            direction           str:: "X" for bays on a numbered grid, "Y" for bays on a lettered grid
+            abscissa            float:: ordinate of grid_on
+            ordinate_from       float:: lower ordinate of the bay limits
+            ordinate_to         float:: upper ordinate of the bay limits
+            ordinate_range      list:: ordinates of every grid from grid_from to grid_to, in grid order
+        """
+        # grid name --> position in grid order, so a bay range is a slice of the ordinates list
+        x_keys, x_ords = list(self.x_grids), list(self.x_grids.values())
+        y_keys, y_ords = list(self.y_grids), list(self.y_grids.values())
+        x_pos = {k: i for i, k in enumerate(x_keys)}
+        y_pos = {k: i for i, k in enumerate(y_keys)}
+        
+        bays_arr = self.df_SFRSbays.iloc[:, 1:].to_numpy() # first col is floor_name
+        sfrs_bays = []
+        for row in bays_arr:
+            floor_bays = []
+            for j, label in enumerate(row):
+                if pd.isna(label):
+                    continue
+                # parse string (e.g. 1;B-E)
+                grid_on, grid_fromto = label.split(";")
+                grid_from, grid_to = grid_fromto.split("-")
+                if grid_on in self.x_grids:
+                    direction = "X"
+                    abscissa = self.x_grids[grid_on]
+                    pos, ords = y_pos, y_ords
+                else:
+                    direction = "Y"
+                    abscissa = self.y_grids[grid_on]
+                    pos, ords = x_pos, x_ords
+                i_from, i_to = sorted((pos[grid_from], pos[grid_to]))
+                ordinate_range = ords[i_from:i_to+1]
+                ordinates = [ords[pos[grid_from]], ords[pos[grid_to]]]
+                floor_bays.append(_SFRSBay(j, label, grid_on, grid_from, grid_to,
+                                           direction, abscissa, min(ordinates), max(ordinates), ordinate_range))
+            sfrs_bays.append(floor_bays)
+        return sfrs_bays
+        
+        
     def add_MFs(self, SapModel):
         """
         Add moment frame members. This is a triple nested loop:
             For every level, for every SFRS bay range on that level, and for each member within the bay range
         """
         N_stories = self.df_SFRSbays.shape[0]
-        N_bays = self.df_SFRSbays.shape[1]
+        
+        # (floor_name, grid) --> uids on that grid line and floor. One pass over the grid groups here
+        # so each bay below is a dict lookup instead of intersecting two freshly built sets
+        on_floor_grid = defaultdict(list)
+        for grid in list(self.x_grids) + list(self.y_grids):
+            for uid in self.index_for[f"on {grid}"]:
+                on_floor_grid[(self.frame_objects[uid].story, grid)].append(uid)
+        ordinates_on = dict()
         
         # loop from each floor from roof to base
-        for i in tqdm(range(N_stories)):
-            floor_name = self.df_SFRSbays.loc[i, "floor_name"]
-            x_bm = self.df_MF.loc[i,"x_beam"]
-            x_col = self.df_MF.loc[i,"x_column"]
-            y_bm = self.df_MF.loc[i,"y_beam"]
-            y_col = self.df_MF.loc[i,"y_column"]
+        rows = zip(self.df_SFRSbays.itertuples(index=False), self.df_MF.itertuples(index=False))
+        pbar = tqdm(rows, total=N_stories)
+        for i, (bay_row, MF_row) in enumerate(pbar):
+            floor_name = bay_row.floor_name
+            pbar.set_description(floor_name)
+            x_bm = MF_row.x_beam
+            x_col = MF_row.x_column
+            y_bm = MF_row.y_beam
+            y_col = MF_row.y_column
             
             # loop through each SFRS bay entered by user
-            for j in range(N_bays-1):
-                SFRS_string = self.df_SFRSbays.iloc[i, j+1] # +1 because first col is floor_name
-                if not pd.isna(SFRS_string):
-                    # parse string (e.g. 1;B-E)
-                    grid_on = SFRS_string.split(";")[0]
-                    grid_fromto = SFRS_string.split(";")[1]
-                    grid_from = grid_fromto.split("-")[0]
-                    grid_to = grid_fromto.split("-")[1]
-                    
-                    # get ordinate limit
-                    if grid_from in self.x_grids:
-                        ordinates = [self.x_grids[grid_from], self.x_grids[grid_to]]
-                        ordinate_from = min(ordinates)
-                        ordinate_to = max(ordinates)
-                        frame_direction = "Y"
-                    else:
-                        ordinates = [self.y_grids[grid_from], self.y_grids[grid_to]]
-                        ordinate_from = min(ordinates)
-                        ordinate_to = max(ordinates)
-                        frame_direction = "X"
+            for bay in self.sfrs_bays[i]:
+                grid_on = bay.grid_on
+                ordinate_from = bay.ordinate_from
+                ordinate_to = bay.ordinate_to
+                frame_direction = bay.direction
+                
+                # loop through relevant members and check if they are in SFRS bay. Member end ordinates
+                # are gathered once per (floor, grid) and reused by every bay on that grid
+                relevant_member_id = on_floor_grid[(floor_name, grid_on)]
+                relevant_frames = [self.frame_objects[uid] for uid in relevant_member_id]
+                if (floor_name, grid_on) not in ordinates_on:
+                    ordinates_on[(floor_name, grid_on)] = modelgenerator.end_ordinates(relevant_frames, frame_direction)
+                in_bay = modelgenerator.frames_in_SFRSbay(relevant_frames, frame_direction, ordinate_from, ordinate_to,
+                                                          ordinates=ordinates_on[(floor_name, grid_on)])
+                for k in np.flatnonzero(in_bay):
+                    # only members inside the bay reach Python. Apply SFRS-related changes
+                    uid = relevant_member_id[k]
+                    frame_obj = relevant_frames[k]
+                    frame_obj.set_releases(SapModel, is_pinned=False)
+                    frame_obj.is_lateral = True
+                    frame_obj.frame_direction = frame_direction
+                    if self.model_options["enable_REZ"]:
+                        frame_obj.set_rigid_end_offset(SapModel)
+                    self.index_for["SFRS"].append(uid)
                     
-                    # loop through relevant members and check if they are in SFRS bay
-                    relevant_member_id = set(self.index_for[f"on {grid_on}"]) & set(self.index_for[floor_name])
-                    for uid in relevant_member_id:
-                        frame_obj = self.frame_objects[uid]
-                        is_in_bay = frame_obj.check_in_SFRSbay(frame_direction, ordinate_from, ordinate_to)
-                        
-                        # if in bay, apply SFRS-related changes
-                        if is_in_bay:
-                            frame_obj.set_releases(SapModel, is_pinned=False)
-                            frame_obj.is_lateral = True
-                            frame_obj.frame_direction = frame_direction
-                            if self.model_options["enable_REZ"]:
-                                frame_obj.set_rigid_end_offset(SapModel)
-                            self.index_for["SFRS"].append(uid)
+                    if frame_direction == "X":
+                        if frame_obj.frame_type == "column":
+                            frame_obj.frame_type = "SFRS_column"
+                            if not pd.isna(x_col):
+                                frame_obj.change_section(SapModel, x_col)
+                                self.index_for["SFRS_columnX"].append(uid)
                             
-                            if frame_direction == "X":
-                                if frame_obj.frame_type == "column":
-                                    frame_obj.frame_type = "SFRS_column"
-                                    if not pd.isna(x_col):
-                                        frame_obj.change_section(SapModel, x_col)
-                                        self.index_for["SFRS_columnX"].append(uid)
-                                    
-                                elif frame_obj.frame_type == "girder":
-                                    frame_obj.frame_type = "SFRS_beam"
-                                    if not pd.isna(x_bm):
-                                        frame_obj.change_section(SapModel, x_bm)
-                                        self.index_for["SFRS_beamX"].append(uid)
+                        elif frame_obj.frame_type == "girder":
+                            frame_obj.frame_type = "SFRS_beam"
+                            if not pd.isna(x_bm):
+                                frame_obj.change_section(SapModel, x_bm)
+                                self.index_for["SFRS_beamX"].append(uid)
+                    
+                    elif frame_direction == "Y":
+                        if frame_obj.frame_type == "column":
+                            frame_obj.frame_type = "SFRS_column"
+                            if not pd.isna(y_col):
+                                frame_obj.change_section(SapModel, y_col)
+                                frame_obj.rotate_axes(SapModel, angle=90)
+                                self.index_for["SFRS_columnY"].append(uid)
                             
-                            elif frame_direction == "Y":
-                                if frame_obj.frame_type == "column":
-                                    frame_obj.frame_type = "SFRS_column"
-                                    if not pd.isna(y_col):
-                                        frame_obj.change_section(SapModel, y_col)
-                                        frame_obj.rotate_axes(SapModel, angle=90)
-                                        self.index_for["SFRS_columnY"].append(uid)
-                                    
-                                elif frame_obj.frame_type == "beam": # y direction girders are bm sized and have type "beam"
-                                    frame_obj.frame_type = "SFRS_beam"
-                                    if not pd.isna(y_bm):
-                                        frame_obj.change_section(SapModel, y_bm)
-                                        self.index_for["SFRS_beamY"].append(uid)
-                             
-                                
+                        elif frame_obj.frame_type == "beam": # y direction girders are bm sized and have type "beam"
+                            frame_obj.frame_type = "SFRS_beam"
+                            if not pd.isna(y_bm):
+                                frame_obj.change_section(SapModel, y_bm)
+                                self.index_for["SFRS_beamY"].append(uid)
+                     
+                        
     def add_braces(self, SapModel):
         """
         Add SFRS braces to structure. Algorithm is similar to add_MFs but we are adding
         new members here instead of just changing section size and properties.
         """
         N_stories = self.df_SFRSbays.shape[0]
-        N_bays = self.df_SFRSbays.shape[1]
         brace_generator_funcs = dict()
         brace_generator_funcs["SingleA"] = self._add_braces_singleA #/
         brace_generator_funcs["SingleB"] = self._add_braces_singleB #\
@@ -513,56 +642,47 @@ class Structure:
         brace_generator_funcs["Chevron"] = self._add_braces_chevron
         
         # loop from each floor from roof to base
-        for i in tqdm(range(N_stories)):
-            SapModel.View.RefreshView()
-            floor_name = self.df_SFRSbays.loc[i, "floor_name"]
-            z_current = self.df_floors.loc[i, "floor_elev"] * 12
-            z_below = z_current - self.df_floors.loc[i, "floor_height"] * 12
+        rows = zip(self.df_SFRSbays.itertuples(index=False), self.df_floors.itertuples(index=False), self.df_braces.itertuples(index=False))
+        pbar = tqdm(rows, total=N_stories)
+        for i, (bay_row, floor_row, brace_row) in enumerate(pbar):
+            floor_name = bay_row.floor_name
+            pbar.set_description(floor_name)
+            z_current = floor_row.floor_elev * 12
+            z_below = z_current - floor_row.floor_height * 12
             
             # loop through each SFRS bay entered by user
-            for j in range(N_bays-1):
-                SFRS_string = self.df_SFRSbays.iloc[i, j+1] # +1 because first col is floor_name
-                if not pd.isna(SFRS_string):
-                    # parse string (e.g. 1;B-E)
-                    grid_on = SFRS_string.split(";")[0]
-                    grid_fromto = SFRS_string.split(";")[1]
-                    start = grid_fromto.split("-")[0]
-                    end = grid_fromto.split("-")[1]
-                    
-                    # get coordinates and other info required to generation brace frames
-                    if grid_on in self.x_grids:
-                        frame_direction = "X" #e.g. 1:A-C
-                        abscissa = self.x_grids[grid_on]
-                        grid_range = [chr(x) for x in range(ord(start), ord(end) +1)]
-                        ordinate_range = [self.y_grids[x] for x in grid_range]
-                        brace_section = self.df_braces.loc[i,"x_brace"]
-                        brace_config = self.df_braces.loc[i,"x_config"]
-                    else:
-                        frame_direction = "Y" #e.g. A:3-7
-                        abscissa = self.y_grids[grid_on]
-                        grid_range = [str(x) for x in range(int(start),int(end)+1)]
-                        ordinate_range = [self.x_grids[x] for x in grid_range]
-                        brace_section = self.df_braces.loc[i,"y_brace"]
-                        brace_config = self.df_braces.loc[i,"y_config"]
+            for bay in self.sfrs_bays[i]:
+                grid_on = bay.grid_on
+                frame_direction = bay.direction
+                abscissa = bay.abscissa
+                ordinate_range = bay.ordinate_range
+                
+                # get coordinates and other info required to generation brace frames
+                if frame_direction == "X": #e.g. 1:A-C
+                    brace_section = brace_row.x_brace
+                    brace_config = brace_row.x_config
+                else: #e.g. A:3-7
+                    brace_section = brace_row.y_brace
+                    brace_config = brace_row.y_config
 
-                    if not pd.isna(brace_section):
-                        # string parsing is hard with backslash (\), implemented a workaround here
-                        if "SingleA" in brace_config:
-                            brace_config = "SingleA"
-                        if "SingleB" in brace_config:
-                            brace_config = "SingleB"
-                         # select the correct brace generation function and call it
-                        brace_generation_func = brace_generator_funcs[brace_config]
-                        brace_generation_func(SapModel = SapModel,
-                                              floor_name = floor_name,
-                                              direction = frame_direction,
-                                              abscissa = abscissa,
-                                              ordinate_range = ordinate_range,
-                                              brace_section = brace_section,
-                                              z_current = z_current,
-                                              z_below = z_below,
-                                              ongrid = grid_on)
-                                
+                if not pd.isna(brace_section):
+                    # string parsing is hard with backslash (\), implemented a workaround here
+                    if "SingleA" in brace_config:
+                        brace_config = "SingleA"
+                    if "SingleB" in brace_config:
+                        brace_config = "SingleB"
+                     # select the correct brace generation function and call it
+                    brace_generation_func = brace_generator_funcs[brace_config]
+                    brace_generation_func(SapModel = SapModel,
+                                          floor_name = floor_name,
+                                          direction = frame_direction,
+                                          abscissa = abscissa,
+                                          ordinate_range = ordinate_range,
+                                          brace_section = brace_section,
+                                          z_current = z_current,
+                                          z_below = z_below,
+                                          ongrid = grid_on)
+                            
     
     def add_walls(self, SapModel):
         """
@@ -570,144 +690,108 @@ class Structure:
         no need to have logic for different brace configurations
         """
         N_stories = self.df_SFRSbays.shape[0]
-        N_bays = self.df_SFRSbays.shape[1]
-        
-        # delete piers previously defined
-        N_pier, pier_list, ret = SapModel.PierLabel.GetNameList()
-        for pier in pier_list:
-            if pier != "P1":
-                ret = SapModel.PierLabel.Delete(pier)
+        openings_arr = self.df_walls_openings.to_numpy()
+        
+        # delete piers previously defined (all but P1) with one edit of the pier label table
+        table_version, csv_str, ret = SapModel.DatabaseTables.GetTableForEditingCSVString("Pier Labels", None)
+        df_piers = pd.read_csv(io.StringIO(csv_str), dtype=str) if ret == 0 and csv_str else None
+        if df_piers is not None and "Name" in df_piers:
+            df_piers = df_piers[df_piers["Name"] == "P1"]
+            ret = SapModel.DatabaseTables.SetTableForEditingCSVString(TableKey = "Pier Labels",
+                                                                      TableVersion = table_version,
+                                                                      csvString = df_piers.to_csv(index=False, lineterminator="\n"))
+            ret = SapModel.DatabaseTables.ApplyEditedTables(True)
+        else:
+            # table not available, delete one label at a time
+            N_pier, pier_list, ret = SapModel.PierLabel.GetNameList()
+            for pier in pier_list:
+                if pier != "P1":
+                    ret = SapModel.PierLabel.Delete(pier)
                 
         # loop from each floor from roof to base
-        for i in tqdm(range(N_stories)):
-            SapModel.View.RefreshView()
-            floor_name = self.df_SFRSbays.loc[i, "floor_name"]
-            z_current = self.df_floors.loc[i, "floor_elev"] * 12
-            z_below = z_current - self.df_floors.loc[i, "floor_height"] * 12
-            x_wall = self.df_walls.loc[i, "x_wall"]
-            y_wall = self.df_walls.loc[i, "y_wall"]
+        rows = zip(self.df_SFRSbays.itertuples(index=False), self.df_floors.itertuples(index=False), self.df_walls.itertuples(index=False))
+        pbar = tqdm(rows, total=N_stories)
+        for i, (bay_row, floor_row, wall_row) in enumerate(pbar):
+            floor_name = bay_row.floor_name
+            pbar.set_description(floor_name)
+            z_current = floor_row.floor_elev * 12
+            z_below = z_current - floor_row.floor_height * 12
+            x_wall = wall_row.x_wall
+            y_wall = wall_row.y_wall
+            
+            # stage wall objects for this floor along with the index lists each one belongs to
+            floor_list = self.index_for_walls[floor_name]
+            walls = []                          # list:: (wall_obj, (index_for_walls lists))
+            openings = []                       # list:: opening wall_obj
             
             # loop through each SFRS bay entered by user
-            for j in range(N_bays-1):
-                SFRS_string = self.df_SFRSbays.iloc[i, j+1]  # +1 because first col is floor_name
-                if not pd.isna(SFRS_string):
-                    # check for wall opening
-                    cell = self.df_walls_openings.iloc[i, j]
-                    opening_vals = None
-                    if not pd.isna(cell):
-                        try:
-                            opening_vals = tuple(float(v) for v in str(cell).strip().strip("()").split(","))
-                        except Exception:
-                            opening_vals = None
-    
-                    # parse string (e.g. 1;B-E)
-                    grid_on, grid_fromto = SFRS_string.split(";")
-                    start, end = grid_fromto.split("-")
-                    pier_label = floor_name + "_" + SFRS_string
-                    
-                    # generate X walls
-                    if not pd.isna(x_wall) and grid_on in self.x_grids:
-                        wall_direction = "X"
-                        abscissa = self.x_grids[grid_on]
-                        grid_range = [chr(x) for x in range(ord(start), ord(end) + 1)]
-                        ordinate_range = [self.y_grids[x] for x in grid_range]
-                        
-                        for k in range(len(ordinate_range)-1):
-                            start_ord = ordinate_range[k]
-                            end_ord = ordinate_range[k+1]
-                            vertices = [(start_ord, abscissa, z_current),
-                                        (end_ord,   abscissa, z_current),
-                                        (end_ord,   abscissa, z_below),
-                                        (start_ord, abscissa, z_below)]
-                            wall_obj = modelgenerator.Wall(
-                                story=floor_name, 
-                                vertices=vertices, 
-                                section=x_wall, 
-                                wall_direction=wall_direction,
-                                pier_label=pier_label
-                            )
-                            wall_obj.add_by_coord(SapModel)
-                            wall_obj.set_pier_label(SapModel)
-                            
-                            # add to relevant groups
-                            self.index_for_walls[floor_name].append(wall_obj.unique_name)
-                            self.index_for_walls[f"on {grid_on}"].append(wall_obj.unique_name)
-                            self.index_for_walls["SFRS_wallX"].append(wall_obj.unique_name)
-                            
-                            # add Wall Opening if present
-                            if opening_vals:
-                                L, B, W, H = opening_vals
-                                vertices = [(start_ord + L,     abscissa, z_below + B + H),
-                                            (start_ord + L + W, abscissa, z_below + B + H),
-                                            (start_ord + L + W, abscissa, z_below + B),
-                                            (start_ord + L,     abscissa, z_below + B)]
-                                wall_obj = modelgenerator.Wall(
-                                    story=floor_name, 
-                                    vertices=vertices, 
-                                    section="Opn", 
-                                    wall_direction=wall_direction,
-                                    pier_label="None"
-                                )
-                                wall_obj.add_by_coord(SapModel)
-                                wall_obj.convert_to_opening(SapModel)
+            for bay in self.sfrs_bays[i]:
+                # check for wall opening
+                cell = openings_arr[i, bay.col]
+                opening_vals = None
+                if not pd.isna(cell):
+                    try:
+                        opening_vals = tuple(float(v) for v in str(cell).strip().strip("()").split(","))
+                    except Exception:
+                        opening_vals = None
     
-                    # generate Y walls
-                    if not pd.isna(y_wall) and grid_on in self.y_grids:
-                        wall_direction = "Y"  # e.g. A:3-7
-                        abscissa = self.y_grids[grid_on]
-                        grid_range = [str(x) for x in range(int(start), int(end)+1)]
-                        ordinate_range = [self.x_grids[x] for x in grid_range]
-                        
-                        for k in range(len(ordinate_range)-1):
-                            start_ord = ordinate_range[k]
-                            end_ord = ordinate_range[k+1]
-                            vertices = [(abscissa, start_ord, z_current),
-                                        (abscissa, end_ord,   z_current),
-                                        (abscissa, end_ord,   z_below),
-                                        (abscissa, start_ord, z_below)]
-                            wall_obj = modelgenerator.Wall(
-                                story=floor_name, 
-                                vertices=vertices, 
-                                section=y_wall, 
-                                wall_direction=wall_direction,
-                                pier_label=pier_label
-                            )
-                            wall_obj.add_by_coord(SapModel)
-                            wall_obj.set_pier_label(SapModel)
-                            
-                            # add to relevant groups
-                            self.index_for_walls[floor_name].append(wall_obj.unique_name)
-                            self.index_for_walls[f"on {grid_on}"].append(wall_obj.unique_name)
-                            self.index_for_walls["SFRS_wallY"].append(wall_obj.unique_name)
-                            
-                            # add Wall Opening if present
-                            if opening_vals:
-                                L, B, W, H = opening_vals
-                                vertices = [(abscissa, start_ord + L,     z_below + B + H),
-                                            (abscissa, start_ord + L + W, z_below + B + H),
-                                            (abscissa, start_ord + L + W, z_below + B),
-                                            (abscissa, start_ord + L,     z_below + B)]
-                                wall_obj = modelgenerator.Wall(
-                                    story=floor_name, 
-                                    vertices=vertices, 
-                                    section="Opn", 
-                                    wall_direction=wall_direction,
-                                    pier_label="None"
-                                )
-                                wall_obj.add_by_coord(SapModel)
-                                wall_obj.convert_to_opening(SapModel)
+                grid_on = bay.grid_on
+                abscissa = bay.abscissa
+                ordinate_range = bay.ordinate_range
+                pier_label = floor_name + "_" + bay.label
+                on_grid = f"on {grid_on}"
+                
+                # wall section and point builder for this bay's direction (1;B-E is an X wall, A;3-7 a Y wall)
+                wall_direction = bay.direction
+                wall_section = x_wall if wall_direction == "X" else y_wall
+                if pd.isna(wall_section):
+                    continue
+                point = _point_builder(wall_direction, abscissa)
+                index_lists = (floor_list, self.index_for_walls[on_grid], self.index_for_walls[f"SFRS_wall{wall_direction}"])
+                make_wall = partial(modelgenerator.Wall, story = floor_name, wall_direction = wall_direction)
+                
+                for start_ord, end_ord, _ in _bay_segments(ordinate_range):
+                    vertices = [point(start_ord, z_current),
+                                point(end_ord,   z_current),
+                                point(end_ord,   z_below),
+                                point(start_ord, z_below)]
+                    wall_obj = make_wall(vertices = vertices, section = wall_section, pier_label = pier_label)
+                    walls.append((wall_obj, index_lists))
                     
+                    # add Wall Opening if present
+                    if opening_vals:
+                        L, B, W, H = opening_vals
+                        vertices = [point(start_ord + L,     z_below + B + H),
+                                    point(start_ord + L + W, z_below + B + H),
+                                    point(start_ord + L + W, z_below + B),
+                                    point(start_ord + L,     z_below + B)]
+                        wall_obj = make_wall(vertices = vertices, section = "Opn", pier_label = "None")
+                        openings.append(wall_obj)
+            
+            # push the whole floor to ETABS in one batch for walls and one for openings, then record uids
+            modelgenerator.Wall.add_many(SapModel, [wall_obj for wall_obj, _ in walls])
+            modelgenerator.Wall.add_many(SapModel, openings, is_opening=True)
+            for wall_obj, index_lists in walls:
+                for index_list in index_lists:
+                    index_list.append(wall_obj.unique_name)
+                
     def set_base_fixity(self, SapModel):
         """Set structural base nodes as fixed or pinned depending on user input"""
         # base is automatically pinned. Only need to execute if user wants fully fixed base
         if self.model_options["base_fixity"] == "Fixed":
-            N_nodes, node_names, x, y, z, ret = SapModel.PointObj.GetAllPoints()
-            bool_mask = np.array([z]) == 0
-            bool_mask = list(bool_mask)[0] # weird np data structure. Convert to simple list
+            # only base nodes are marshalled back, not every point in the model
+            N_nodes, node_names, ret = SapModel.PointObj.GetNameListOnStory("Base")
+            if N_nodes == 0:
+                return
             
-            for i in range(len(bool_mask)):
-                if bool_mask[i]:
-                    SapModel.PointObj.SetRestraint(Name=node_names[i], Value=[True, True, True, True, True, True])
+            # select every node in the base plane through any one of them, then fix the whole
+            # selection with a single call (ItemType=2 is SelectedObjects)
+            ret = SapModel.SelectObj.ClearSelection()
+            ret = SapModel.SelectObj.PlaneXY(node_names[0])
+            ret = SapModel.PointObj.SetRestraint(Name = "",
+                                                 Value = [True, True, True, True, True, True],
+                                                 ItemType = 2)
+            ret = SapModel.SelectObj.ClearSelection()
         
         
     def set_groups(self, SapModel):
@@ -723,294 +807,158 @@ class Structure:
                       "SFRS_WALL X",
                       "SFRS_WALL Y"]
         N_groups, group_names, ret = SapModel.GroupDef.GetNameList()
+        existing_groups = set(group_names or ())
         
         # delete and recreate groups if they exist already
         for group in group_list:
-            if group in group_names:
+            if group in existing_groups:
                 ret = SapModel.GroupDef.Delete(group)
                 ret = SapModel.GroupDef.SetGroup_1(group)
             else:
                 ret = SapModel.GroupDef.SetGroup_1(group)
         
-        # main SFRS group
-        for uid in self.index_for["SFRS"]:
-            SapModel.FrameObj.SetGroupAssign(Name = uid, GroupName = "ALL LATERAL")
-        for uid in self.index_for_walls["SFRS_wallX"]:
-            SapModel.AreaObj.SetGroupAssign(Name = uid, GroupName = "ALL LATERAL")
-        for uid in self.index_for_walls["SFRS_wallY"]:
-            SapModel.AreaObj.SetGroupAssign(Name = uid, GroupName = "ALL LATERAL")
-        
-        # Other SFRS groups
-        for uid in self.index_for["SFRS_beamX"]:
-            SapModel.FrameObj.SetGroupAssign(Name = uid, GroupName = "SFRS_BM X")
-        for uid in self.index_for["SFRS_beamY"]:
-            SapModel.FrameObj.SetGroupAssign(Name = uid, GroupName = "SFRS_BM Y")
-        for uid in self.index_for["SFRS_columnX"]:
-            SapModel.FrameObj.SetGroupAssign(Name = uid, GroupName = "SFRS_COL X")
-        for uid in self.index_for["SFRS_columnY"]:
-            SapModel.FrameObj.SetGroupAssign(Name = uid, GroupName = "SFRS_COL Y")
-        for uid in self.index_for["SFRS_braceX"]:
-            SapModel.FrameObj.SetGroupAssign(Name = uid, GroupName = "SFRS_BRACE X")
-        for uid in self.index_for["SFRS_braceY"]:
-            SapModel.FrameObj.SetGroupAssign(Name = uid, GroupName = "SFRS_BRACE Y")
-        
-        # wall element groups
-        for uid in self.index_for_walls["SFRS_wallX"]:
-            SapModel.AreaObj.SetGroupAssign(Name = uid, GroupName = "SFRS_WALL X")
-        for uid in self.index_for_walls["SFRS_wallX"]:
-            SapModel.AreaObj.SetGroupAssign(Name = uid, GroupName = "SFRS_WALL Y")
+        # (uids, group names, assign function) for every group. Bound methods are looked up once.
+        # each uid list is walked once and assigned to all of its groups in the same pass
+        frame_assign = SapModel.FrameObj.SetGroupAssign
+        area_assign = SapModel.AreaObj.SetGroupAssign
+        group_specs = [(self.index_for["SFRS"],               ("ALL LATERAL",),                 frame_assign),  # main SFRS group
+                       (self.index_for["SFRS_beamX"],         ("SFRS_BM X",),                   frame_assign),  # other SFRS groups
+                       (self.index_for["SFRS_beamY"],         ("SFRS_BM Y",),                   frame_assign),
+                       (self.index_for["SFRS_columnX"],       ("SFRS_COL X",),                  frame_assign),
+                       (self.index_for["SFRS_columnY"],       ("SFRS_COL Y",),                  frame_assign),
+                       (self.index_for["SFRS_braceX"],        ("SFRS_BRACE X",),                frame_assign),
+                       (self.index_for["SFRS_braceY"],        ("SFRS_BRACE Y",),                frame_assign),
+                       (self.index_for_walls["SFRS_wallX"],   ("ALL LATERAL", "SFRS_WALL X"),   area_assign),   # wall element groups
+                       (self.index_for_walls["SFRS_wallY"],   ("ALL LATERAL", "SFRS_WALL Y"),   area_assign)]
+        for uids, target_groups, assign in group_specs:
+            for uid in uids:
+                for group_name in target_groups:
+                    ret = assign(Name = uid, GroupName = group_name)
+        
+        # one group per (floor, category) so update.py can resize each with a single SetSection/SetProperty call.
+        # category sets are built once; each floor's (short) list is walked and probed against them
+        group_plan = [(self.index_for,       {c: set(self.index_for[c]) for c in self.SECTION_CATEGORIES},    frame_assign),
+                      (self.index_for_walls, {c: set(self.index_for_walls[c]) for c in self.WALL_CATEGORIES}, area_assign)]
+        for floor_name in self.floor_names:
+            for index, category_sets, assign in group_plan:
+                floor_members = index[floor_name]
+                for category, category_set in category_sets.items():
+                    uids = [uid for uid in floor_members if uid in category_set]
+                    if len(uids) == 0:
+                        continue
+                    group = self.section_group(floor_name, category)
+                    if group in existing_groups:
+                        ret = SapModel.GroupDef.Delete(group)
+                    ret = SapModel.GroupDef.SetGroup_1(group)
+                    for uid in uids:
+                        ret = assign(Name = uid, GroupName = group)
+        
+        
+    @staticmethod
+    def section_group(floor_name, category):
+        """Name of the ETABS group holding the frames or walls of one category on one floor. See set_groups()"""
+        return f"MG {floor_name} {category}"
         
         
 
+    def _tag_braces(self, frame_list, floor_name, direction, ongrid):
+        """
+        Helper method called by the brace helpers. Marks the new braces as lateral and records their uids.
+        Index lists are looked up once per call and extended, rather than four dict lookups per brace
+        """
+        uids = [frame.unique_name for frame in frame_list]
+        for frame in frame_list:
+            frame.is_lateral = True
+            frame.frame_direction = direction
+        for index_group in (floor_name, f"on {ongrid}", "SFRS", f"SFRS_brace{direction}"):
+            self.index_for[index_group].extend(uids)
+        
+        
     def _add_braces_singleA(self, SapModel, floor_name, direction, abscissa, ordinate_range, brace_section,
                             z_current, z_below, ongrid):
         """Helper method called by self.add_braces()"""
-        for k in range(len(ordinate_range)-1):
-            start = ordinate_range[k]
-            end = ordinate_range[k+1]
-            
-            if direction == "X":
-                end_coords = [(start,  abscissa,   z_below),
-                              (end,    abscissa,   z_current)]
-                index_group = "SFRS_braceX"
-            elif direction == "Y":
-                end_coords = [(abscissa,  start,   z_below),
-                              (abscissa,    end,   z_current)]
-                index_group = "SFRS_braceY"
+        point = _point_builder(direction, abscissa)
+        make_frame = partial(modelgenerator.Frame, frame_type = "SFRS_brace", story = floor_name, section = brace_section)
+        frame_list = []
+        for start, end, _ in _bay_segments(ordinate_range):
+            end_coords = [point(start, z_below),
+                          point(end,   z_current)]
             
-            # add brace and set properties
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords)
-            frame_obj.add_by_coord(SapModel)
-            frame_obj.set_releases(SapModel, is_pinned=False)
-            if self.model_options["enable_REZ"]:
-                frame_obj.set_rigid_end_offset(SapModel)
-            frame_obj.is_lateral = True
-            frame_obj.frame_direction = direction
+            # stage brace member
+            frame_obj = make_frame(end_coords = end_coords)
+            frame_list.append(frame_obj)
             
-            # add to relevant groups
-            self.index_for[floor_name].append(frame_obj.unique_name)
-            self.index_for[f"on {ongrid}"].append(frame_obj.unique_name)
-            self.index_for["SFRS"].append(frame_obj.unique_name)
-            self.index_for[index_group].append(frame_obj.unique_name)
+        # apply SFRS related properties
+        modelgenerator.Frame.add_many(SapModel, frame_list, rigid_end=self.model_options["enable_REZ"])
+        self._tag_braces(frame_list, floor_name, direction, ongrid)
         
         
     def _add_braces_singleB(self, SapModel, floor_name, direction, abscissa, ordinate_range, brace_section,
                             z_current, z_below, ongrid):
         """Helper method called by self.add_braces()"""
-        for k in range(len(ordinate_range)-1):
-            start = ordinate_range[k+1]
-            end = ordinate_range[k]
-            
-            if direction == "X":
-                end_coords = [(start,  abscissa,   z_below),
-                              (end,    abscissa,   z_current)]
-                index_group = "SFRS_braceX"
-            elif direction == "Y":
-                end_coords = [(abscissa,  start,   z_below),
-                              (abscissa,    end,   z_current)]
-                index_group = "SFRS_braceY"
+        point = _point_builder(direction, abscissa)
+        make_frame = partial(modelgenerator.Frame, frame_type = "SFRS_brace", story = floor_name, section = brace_section)
+        frame_list = []
+        for end, start, _ in _bay_segments(ordinate_range):   # diagonal runs from the far grid back
+            end_coords = [point(start, z_below),
+                          point(end,   z_current)]
             
-            # add brace and set properties
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords)
-            frame_obj.add_by_coord(SapModel)
-            frame_obj.set_releases(SapModel, is_pinned=False)
-            if self.model_options["enable_REZ"]:
-                frame_obj.set_rigid_end_offset(SapModel)
-            frame_obj.is_lateral = True
-            frame_obj.frame_direction = direction
+            # stage brace member
+            frame_obj = make_frame(end_coords = end_coords)
+            frame_list.append(frame_obj)
             
-            # add to relevant groups
-            self.index_for[floor_name].append(frame_obj.unique_name)
-            self.index_for[f"on {ongrid}"].append(frame_obj.unique_name)
-            self.index_for["SFRS"].append(frame_obj.unique_name)
-            self.index_for[index_group].append(frame_obj.unique_name)
+        # apply SFRS related properties
+        modelgenerator.Frame.add_many(SapModel, frame_list, rigid_end=self.model_options["enable_REZ"])
+        self._tag_braces(frame_list, floor_name, direction, ongrid)
         
     
     def _add_braces_V(self, SapModel, floor_name, direction, abscissa, ordinate_range, brace_section,
                             z_current, z_below, ongrid):
         """Helper method called by self.add_braces()"""
-        frame_list = []
-        for k in range(len(ordinate_range)-1):
-            start = ordinate_range[k]
-            end = ordinate_range[k+1]
-            midpoint = (end + start)/2
-            
-            if direction == "X":
-                end_coords1 = [(start,      abscissa,   z_current),
-                              (midpoint,    abscissa,   z_below)]
-                
-                end_coords2 = [(midpoint,   abscissa,   z_below),
-                              (end,         abscissa,   z_current)]
-                index_group = "SFRS_braceX"
-                
-            elif direction == "Y":
-                end_coords1 = [(abscissa,   start,      z_current),
-                              (abscissa,    midpoint,   z_below)]
-                
-                end_coords2 = [(abscissa,   midpoint,   z_below),
-                              (abscissa,    end,        z_current)]
-                index_group = "SFRS_braceY"
-            
-            # add first brace member
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords1)
-            frame_list.append(frame_obj)
-            
-            # add second brace member
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords2)
-            frame_list.append(frame_obj)
+        make_frame = partial(modelgenerator.Frame, frame_type = "SFRS_brace", story = floor_name, section = brace_section)
+        coords = _brace_coords(direction, abscissa, ordinate_range,
+                               ordinates = [[_START, _MID], [_MID, _END]],
+                               zs = [[z_current, z_below], [z_below, z_current]])
+        
+        # add brace members
+        frame_list = [make_frame(end_coords = end_coords) for end_coords in coords.tolist()]
         
         # apply SFRS related properties
-        for frame in frame_list:
-            frame.add_by_coord(SapModel)
-            frame.set_releases(SapModel, is_pinned=False)
-            if self.model_options["enable_REZ"]:
-                frame.set_rigid_end_offset(SapModel)
-            frame.is_lateral = True
-            frame.frame_direction = direction
-            self.index_for[floor_name].append(frame.unique_name)
-            self.index_for[f"on {ongrid}"].append(frame.unique_name)
-            self.index_for["SFRS"].append(frame.unique_name)
-            self.index_for[index_group].append(frame.unique_name)
+        modelgenerator.Frame.add_many(SapModel, frame_list, rigid_end=self.model_options["enable_REZ"])
+        self._tag_braces(frame_list, floor_name, direction, ongrid)
     
     
     def _add_braces_chevron(self, SapModel, floor_name, direction, abscissa, ordinate_range, brace_section,
                             z_current, z_below, ongrid):
         """Helper method called by self.add_braces()"""
-        frame_list = []
-        for k in range(len(ordinate_range)-1):
-            start = ordinate_range[k]
-            end = ordinate_range[k+1]
-            midpoint = (end + start)/2
-            
-            if direction == "X":
-                end_coords1 = [(start,      abscissa,   z_below),
-                              (midpoint,    abscissa,   z_current)]
-                
-                end_coords2 = [(midpoint,   abscissa,   z_current),
-                              (end,         abscissa,   z_below)]
-                index_group = "SFRS_braceX"
-                
-            elif direction == "Y":
-                end_coords1 = [(abscissa,   start,      z_below),
-                              (abscissa,    midpoint,   z_current)]
-                
-                end_coords2 = [(abscissa,   midpoint,   z_current),
-                              (abscissa,    end,        z_below)]
-                index_group = "SFRS_braceY"
-            
-            # add first brace member
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords1)
-            frame_list.append(frame_obj)
-
-            # add second brace member
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords2)
-            frame_list.append(frame_obj)
-            
+        make_frame = partial(modelgenerator.Frame, frame_type = "SFRS_brace", story = floor_name, section = brace_section)
+        coords = _brace_coords(direction, abscissa, ordinate_range,
+                               ordinates = [[_START, _MID], [_MID, _END]],
+                               zs = [[z_below, z_current], [z_current, z_below]])
+        
+        # add brace members
+        frame_list = [make_frame(end_coords = end_coords) for end_coords in coords.tolist()]
+        
         # apply SFRS related properties
-        for frame in frame_list:
-            frame.add_by_coord(SapModel)
-            frame.set_releases(SapModel, is_pinned=False)
-            if self.model_options["enable_REZ"]:
-                frame.set_rigid_end_offset(SapModel)
-            frame.is_lateral = True
-            frame.frame_direction = direction
-            self.index_for[floor_name].append(frame.unique_name)
-            self.index_for[f"on {ongrid}"].append(frame.unique_name)
-            self.index_for["SFRS"].append(frame.unique_name)
-            self.index_for[index_group].append(frame.unique_name)
+        modelgenerator.Frame.add_many(SapModel, frame_list, rigid_end=self.model_options["enable_REZ"])
+        self._tag_braces(frame_list, floor_name, direction, ongrid)
             
     
     def _add_braces_X(self, SapModel, floor_name, direction, abscissa, ordinate_range, brace_section,
                             z_current, z_below, ongrid):
         """Helper method called by self.add_braces()"""
-        frame_list = []
-        for k in range(len(ordinate_range)-1):
-            start = ordinate_range[k]
-            end = ordinate_range[k+1]
-            midpoint = (end + start)/2
-            z_mid = (z_current + z_below)/2
-            
-            if direction == "X":
-                end_coords1 = [(start,      abscissa,   z_below),
-                              (midpoint,    abscissa,   z_mid)]
-                
-                end_coords2 = [(midpoint,   abscissa,   z_mid),
-                              (end,         abscissa,   z_current)]
-                
-                end_coords3 = [(start,      abscissa,   z_current),
-                              (midpoint,    abscissa,   z_mid)]
-                
-                end_coords4 = [(midpoint,   abscissa,   z_mid),
-                              (end,         abscissa,   z_below)]
-                
-                index_group = "SFRS_braceX"
-                
-            elif direction == "Y":
-                end_coords1 = [(abscissa,   start,      z_below),
-                              (abscissa,    midpoint,   z_mid)]
-                
-                end_coords2 = [(abscissa,   midpoint,   z_mid),
-                              (abscissa,    end,        z_current)]
-                
-                end_coords3 = [(abscissa,   start,      z_current),
-                              (abscissa,    midpoint,   z_mid)]
-                
-                end_coords4 = [(abscissa,   midpoint,   z_mid),
-                              (abscissa,    end,        z_below)]
-                index_group = "SFRS_braceY"
-            
-            # add brace members
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords1)
-            frame_list.append(frame_obj)
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords2)
-            frame_list.append(frame_obj)
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords3)
-            frame_list.append(frame_obj)
-            frame_obj = modelgenerator.Frame(frame_type = "SFRS_brace", 
-                                             story = floor_name, 
-                                             section = brace_section, 
-                                             end_coords = end_coords4)
-            frame_list.append(frame_obj)
-            
+        make_frame = partial(modelgenerator.Frame, frame_type = "SFRS_brace", story = floor_name, section = brace_section)
+        z_mid = (z_current + z_below)/2
+        coords = _brace_coords(direction, abscissa, ordinate_range,
+                               ordinates = [[_START, _MID], [_MID, _END], [_START, _MID], [_MID, _END]],
+                               zs = [[z_below, z_mid], [z_mid, z_current], [z_current, z_mid], [z_mid, z_below]])
+        
+        # add brace members
+        frame_list = [make_frame(end_coords = end_coords) for end_coords in coords.tolist()]
+        
         # apply SFRS related properties
-        for frame in frame_list:
-            frame.add_by_coord(SapModel)
-            frame.set_releases(SapModel, is_pinned=False)
-            if self.model_options["enable_REZ"]:
-                frame.set_rigid_end_offset(SapModel)
-            frame.is_lateral = True
-            frame.frame_direction = direction
-            self.index_for[floor_name].append(frame.unique_name)
-            self.index_for[f"on {ongrid}"].append(frame.unique_name)
-            self.index_for["SFRS"].append(frame.unique_name)
-            self.index_for[index_group].append(frame.unique_name)
+        modelgenerator.Frame.add_many(SapModel, frame_list, rigid_end=self.model_options["enable_REZ"])
+        self._tag_braces(frame_list, floor_name, direction, ongrid)
                     
                     
         
\ No newline at end of file
@@ -1,3 +1,8 @@
+import logging
+from modelgenerator.sapmodel import _ok
+
+logger = logging.getLogger(__name__)
+
 
 class Wall:
     """
@@ -21,29 +26,49 @@ class Wall:
         
         
     def add_by_coord(self, SapModel):
-        """Add floor object to ETABS model"""
+        """Add wall object to ETABS model"""
+        X, Y, Z = zip(*self.vertices)
         ret = SapModel.AreaObj.AddByCoord(NumberPoints = 4,
-                                          X = [xyz[0] for xyz in self.vertices],
-                                          Y = [xyz[1] for xyz in self.vertices],
-                                          Z = [xyz[2] for xyz in self.vertices],
+                                          X = list(X),
+                                          Y = list(Y),
+                                          Z = list(Z),
                                           PropName = self.section)
         self.unique_name = ret[3]
-        if ret[-1] != 0:
-            print(f"WARNING: failed to add wall shell: {self.unique_name} on {self.story}")
+        if not _ok(ret):
+            logger.warning("failed to add wall shell: %s on %s", self.unique_name, self.story)
+            
+    @classmethod
+    def add_many(cls, SapModel, walls, is_opening=False):
+        """
+        Add a batch of wall objects to ETABS. The caller unlocks the model once before adding anything
+        (see run.py), and each distinct pier label is defined once for the whole batch instead of once per wall shell.
+        Openings (is_opening=True) are converted to openings instead of getting a pier label.
+        Must run on the thread that attached to ETABS; the SapModel proxy is not shareable across threads
+        """
+        if not is_opening:
+            for pier_label in dict.fromkeys(wall_obj.pier_label for wall_obj in walls):
+                ret = SapModel.PierLabel.SetPier(pier_label)
+        for wall_obj in walls:
+            wall_obj.add_by_coord(SapModel)
+            if is_opening:
+                wall_obj.convert_to_opening(SapModel)
+            else:
+                wall_obj.set_pier_label(SapModel, define_label=False)
             
     def convert_to_opening(self, SapModel):
         #todo
         ret = SapModel.AreaObj.SetOpening(Name = self.unique_name,
                                           IsOpening = True)
-        if ret != 0:
-            print(f"WARNING: failed to convert to opening: {self.unique_name} on {self.story}")
+        if not _ok(ret):
+            logger.warning("failed to convert to opening: %s on %s", self.unique_name, self.story)
             
-    def set_pier_label(self, SapModel):
-        """Add this wall shell to pier group"""
-        ret = SapModel.PierLabel.SetPier(self.pier_label)
+    def set_pier_label(self, SapModel, define_label=True):
+        """Add this wall shell to pier group. define_label=False skips defining the label if it already exists"""
+        if define_label:
+            ret = SapModel.PierLabel.SetPier(self.pier_label)
         ret = SapModel.AreaObj.SetPier(Name = self.unique_name,
                                        PierName = self.pier_label)
-        if ret != 0:
-            print(f"WARNING: could not add wall shell ({self.unique_name})")
+        if not _ok(ret):
+            logger.warning("could not add wall shell (%s)", self.unique_name)
             
         
\ No newline at end of file
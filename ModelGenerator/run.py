@@ -1,15 +1,18 @@
 import os
 import sys
+import logging
 import time
-import pickle
+import json
 import pandas as pd
 import xlwings as xw
 import comtypes.client
 import modelgenerator
+from modelgenerator.sheet import cell_block, filled_table, grid_ordinates
 
 CURRENT_WORKING_FOLDER = os.path.dirname(os.path.dirname(__file__))
 INPUT_SHEET_NAME = "Input"
 XLSX_FILE_NAME = "ETABS Model Generator.xlsm"
+INPUT_RANGE = "C8:AU79"     # smallest block covering every input table on the sheet. Read with one COM call
 
 
 def main():
@@ -29,36 +32,43 @@ def main():
     SapModel, ETABSObject = ETABS_API_connect()
     SapModel.SetPresentUnits(3) #kip.in
     
-    print("Generating stories and grids...")
-    Structure.create_elevations(SapModel)  # this MUST be done first
-    Structure.create_grids(SapModel)
-    SapModel.View.RefreshView(Zoom=False)
-
-    print("Generating floors...")
-    Structure.create_floors(SapModel)
-    SapModel.View.RefreshView(Zoom=False)
-    
-    print("Generating frames...")
-    Structure.create_frames(SapModel)
-    SapModel.View.RefreshView(Zoom=False)
-    
-    print("Deleting frames outside of floor boundary...")
-    Structure.delete_frames(SapModel)
-    SapModel.View.RefreshView(Zoom=False)
-    
-    print("Adding SFRS to model...")
-    Structure.add_SFRS(SapModel)
-    SapModel.View.RefreshView(Zoom=False)
-    
-    print("Applying finishing touches...")
-    Structure.set_base_fixity(SapModel)
-    Structure.set_groups(SapModel)
-    SapModel.View.RefreshView(Zoom=False)
-    
-    # pickle Structure for use later
-    pkl_filepath = os.path.join(CURRENT_WORKING_FOLDER, "ModelGeneratorData.pkl")
-    with open(pkl_filepath, "wb") as f:
-        pickle.dump(Structure, f)
+    # unlock once for the whole run and hide the ETABS window so it does no redraw work during generation.
+    # the window always comes back, even if a stage fails part way through
+    SapModel.SetModelIsLocked(False)
+    ETABSObject.Hide()
+    try:
+        print("Generating stories and grids...")
+        Structure.create_elevations(SapModel)  # this MUST be done first
+        Structure.create_grids(SapModel)
+        
+        print("Generating floors...")
+        Structure.create_floors(SapModel)
+        
+        print("Generating frames...")
+        Structure.create_frames(SapModel)
+        
+        print("Deleting frames outside of floor boundary...")
+        Structure.delete_frames(SapModel)
+        
+        print("Adding SFRS to model...")
+        Structure.add_SFRS(SapModel)
+        
+        print("Applying finishing touches...")
+        Structure.set_base_fixity(SapModel)
+        Structure.set_groups(SapModel)
+    finally:
+        ETABSObject.Unhide()
+        # redraw once at the end. Refreshing between stages only blocks on a viewport nobody is looking at yet
+        SapModel.View.RefreshView(Zoom=True)
+    
+    # save index groups for update.py. Plain JSON, so loading it later cannot run code the way a pickle can
+    json_filepath = os.path.join(CURRENT_WORKING_FOLDER, "ModelGeneratorData.json")
+    with open(json_filepath, "w") as f:
+        json.dump(Structure.to_dict(), f)
+    # sections recorded by update.py belong to the previous model
+    state_filepath = os.path.join(CURRENT_WORKING_FOLDER, "ModelGeneratorState.json")
+    if os.path.exists(state_filepath):
+        os.remove(state_filepath)
     
     end_time = time.time()
     print("\nModel generated successfully!")
@@ -72,32 +82,24 @@ def read_user_input(sheet):
     """
     Reads the ETABS model generator spreadsheet and return in either dataframe or dict format
     """
+    # every table comes out of one block read, then gets sliced here
+    raw = sheet.range(INPUT_RANGE).value
+    
     # floor elevation
     headers = ["floor_name", "floor_height", "floor_elev", "SD_load", "live_load", "cladding_load", "floor_polygon","na","na","na","na", "slab", "girder", "beam", "column"]
-    df_floors = pd.DataFrame(sheet.range("C8:Q32").value, columns = headers)
-    df_floors = df_floors.dropna(subset=["floor_name"])
-    df_floors = df_floors.dropna(axis=1, how = "all")
-    df_floors.reset_index(drop=True)
+    df_floors = filled_table(cell_block(raw, "C8:Q32", INPUT_RANGE), headers, drop_empty_columns=True)
     
     # grid system
-    xgrid_name = list(sheet.range("T8:T32").value)
-    xgrid_ordinate = list(sheet.range("U8:U32").value)
-    x_grids = {str(k):v*12 for k,v in zip(xgrid_name, xgrid_ordinate) if not pd.isna(v)}
-    
-    ygrid_name = list(sheet.range("V8:V32").value)
-    ygrid_ordinate = list(sheet.range("W8:W32").value)
-    y_grids = {str(k):v*12 for k,v in zip(ygrid_name, ygrid_ordinate) if not pd.isna(v)}
+    x_grids = grid_ordinates(cell_block(raw, "T8:U32", INPUT_RANGE))
+    y_grids = grid_ordinates(cell_block(raw, "V8:W32", INPUT_RANGE))
     
     # SFRS bays
     headers = ["floor_name", "bay_1", "bay_2", "bay_3", "bay_4", "bay_5", "bay_6", "bay_7", "bay_8", "bay_9", "bay_10", "bay_11", "bay_12", "bay_13", "bay_14", "bay_15"]
-    df_SFRSbays = pd.DataFrame(sheet.range("C38:R73").value, columns = headers)
-    df_SFRSbays = df_SFRSbays.dropna(subset=["floor_name"])
-    df_SFRSbays = df_SFRSbays.dropna(axis=1, how = "all")
-    df_SFRSbays.reset_index(drop=True)
+    df_SFRSbays = filled_table(cell_block(raw, "C38:R73", INPUT_RANGE), headers, drop_empty_columns=True)
     
     # moment frame members
     headers = ["x_column", "x_beam", "y_column", "y_beam"]
-    df_MF = pd.DataFrame(sheet.range("T38:W73").value, columns = headers)
+    df_MF = pd.DataFrame(cell_block(raw, "T38:W73", INPUT_RANGE), columns = headers)
     # df_MF = df_MF.dropna(subset=["x_column"])
     df_MF.reset_index(drop=True)
     if len(df_MF)==0:
@@ -105,7 +107,7 @@ def read_user_input(sheet):
         
     # brace members
     headers = ["x_brace", "x_config", "y_brace", "y_config"]
-    df_braces = pd.DataFrame(sheet.range("Y38:AB73").value, columns = headers)
+    df_braces = pd.DataFrame(cell_block(raw, "Y38:AB73", INPUT_RANGE), columns = headers)
     # df_braces = df_braces.dropna(subset=["x_brace"])
     df_braces.reset_index(drop=True)
     if len(df_braces)==0:
@@ -113,7 +115,7 @@ def read_user_input(sheet):
     
     # wall members
     headers = ["x_wall", "y_wall"]
-    df_walls = pd.DataFrame(sheet.range("AD38:AE73").value, columns = headers)
+    df_walls = pd.DataFrame(cell_block(raw, "AD38:AE73", INPUT_RANGE), columns = headers)
     # df_walls = df_walls.dropna(subset=["x_wall"])
     df_walls.reset_index(drop=True)
     if len(df_walls)==0:
@@ -121,18 +123,19 @@ def read_user_input(sheet):
     
     # wall openings
     headers = ["bay_1_O", "bay_2_O", "bay_3_O", "bay_4_O", "bay_5_O", "bay_6_O", "bay_7_O", "bay_8_O", "bay_9_O", "bay_10_O", "bay_11_O", "bay_12_O", "bay_13_O", "bay_14_O", "bay_15_O"]
-    df_walls_openings = pd.DataFrame(sheet.range("AG38:AU73").value, columns = headers)
+    df_walls_openings = pd.DataFrame(cell_block(raw, "AG38:AU73", INPUT_RANGE), columns = headers)
     #df_walls_openings = df_walls.dropna(subset=["bay_1_O"])
     df_walls_openings.reset_index(drop=True)
     if len(df_walls_openings)==0:
         df_walls_openings = None
     
     # other model options
+    [diaphragm_type], [base_fixity], [enable_REZ], [n_infill] = cell_block(raw, "F76:F79", INPUT_RANGE)
     model_options = dict()
-    model_options["diaphragm_type"] = sheet.range('F76').value
-    model_options["base_fixity"] = sheet.range('F77').value
-    model_options["enable_REZ"] = sheet.range('F78').value
-    model_options["n_infill"] = int(sheet.range('F79').value)
+    model_options["diaphragm_type"] = diaphragm_type
+    model_options["base_fixity"] = base_fixity
+    model_options["enable_REZ"] = enable_REZ
+    model_options["n_infill"] = int(n_infill)
     
     return df_floors, x_grids, y_grids, df_SFRSbays, df_MF, df_braces, df_walls, df_walls_openings, model_options
 
@@ -149,12 +152,13 @@ def ETABS_API_connect():
     except (OSError, comtypes.COMError):
         print("No running instance of the program found or failed to attach.")
         sys.exit(-1)
-    SapModel = myETABSObject.SapModel
+    SapModel = modelgenerator.SapModelCache(myETABSObject.SapModel)
     return SapModel, myETABSObject
 
 
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(levelname)s: %(message)s")
     print("##################################################################################")
     print(r"""
   __  __           _      _  _____                           _             
@@ -0,0 +1,51 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeApi:
+    """
+    One SapModel sub-interface (FrameObj, GroupDef, ...). Every method call is recorded and succeeds.
+    AddByCoord hands back a new unique name
+    """
+    def __init__(self, model, name):
+        self._model = model
+        self._name = name
+        
+        
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self._model.calls.append((self._name, method, kwargs))
+            if method == "AddByCoord":
+                self._model.n_added += 1
+                return [f"{self._name[0]}{self._model.n_added}", 0]
+            if method == "GetEndLengthOffset":
+                return [True, 0, 0, 1, 0]
+            return 0
+        return call
+
+
+
+class FakeSapModel:
+    """Stands in for the ETABS SapModel so geometry can be generated without ETABS"""
+    def __init__(self):
+        self.calls = []
+        self.n_added = 0
+        
+        
+    def __getattr__(self, name):
+        return FakeApi(self, name)
+    
+    
+    def added_frames(self):
+        """End coords ((xi,yi,zi), (xj,yj,zj)) of every FrameObj.AddByCoord call, in call order"""
+        return [((k["XI"], k["YI"], k["ZI"]), (k["XJ"], k["YJ"], k["ZJ"]))
+                for name, method, k in self.calls if name == "FrameObj" and method == "AddByCoord"]
+
+
+
+@pytest.fixture
+def sap_model():
+    return FakeSapModel()
@@ -0,0 +1,36 @@
+import pandas as pd
+from modelgenerator.sheet import cell_block, filled_table, grid_ordinates
+
+
+def test_cell_block_slices_relative_to_origin():
+    raw = [[f"{col}{row}" for col in "CDEF"] for row in range(8, 12)]     # C8:F11
+    assert cell_block(raw, "D9:E10", "C8:F11") == [["D9", "E9"], ["D10", "E10"]]
+    assert cell_block(raw, "F8:F8", "C8") == [["F8"]]
+
+
+def test_filled_table_keeps_y_only_rows():
+    # wall table (x_wall, y_wall). The second floor only has Y walls and must keep its row
+    block = [["Wall18", "Wall18"],
+             [None,     "Wall24"],
+             [None,     None]]
+    df = filled_table(block, ["x_wall", "y_wall"], any_cell=True)
+    assert list(df.index) == [0, 1]
+    assert df.loc[1, "y_wall"] == "Wall24"
+    assert pd.isna(df.loc[1, "x_wall"])
+
+
+def test_filled_table_drops_unnamed_rows_and_blank_columns():
+    block = [["Level 2", None, 12.0],
+             [None,      None, 99.0],
+             ["Level 1", None, 10.0]]
+    df = filled_table(block, ["floor_name", "na", "floor_height"], drop_empty_columns=True)
+    assert list(df.columns) == ["floor_name", "floor_height"]
+    assert list(df.index) == [0, 2]
+    assert df["floor_height"].tolist() == [12.0, 10.0]
+    
+    assert filled_table([[None, 1.0]], ["floor_name", "floor_height"]) is None
+
+
+def test_grid_ordinates_go_from_feet_to_inches():
+    block = [[1.0, 0.0], ["2", 31.0], [None, None], ["3", 62.5]]
+    assert grid_ordinates(block) == {"1.0": 0.0, "2": 372.0, "3": 750.0}
@@ -0,0 +1,162 @@
+"""
+Parity checks of the vectorized geometry in Structure against the original loop-by-loop implementation,
+which is written out in each test as the reference
+"""
+import pytest
+import pandas as pd
+import shapely
+import modelgenerator
+
+X_GRIDS = {"1": 0.0, "2": 300.0, "3": 660.0}                 # numbered grids, Y ordinate
+Y_GRIDS = {"A": 0.0, "B": 240.0, "C": 480.0, "D": 840.0}     # lettered grids, X ordinate
+
+
+def make_structure(n_infill=2):
+    structure = modelgenerator.Structure(*[None]*9)
+    structure.x_grids = dict(X_GRIDS)
+    structure.y_grids = dict(Y_GRIDS)
+    structure.df_floors = pd.DataFrame({"floor_name": ["ROOF", "L2"],
+                                        "floor_height": [12.0, 14.0],
+                                        "floor_elev": [26.0, 14.0],
+                                        "column": ["W14X90", "W14X120"],
+                                        "girder": ["W18X35", "W18X35"],
+                                        "beam": ["W16X26", "W16X26"]})
+    structure.floor_names = structure.df_floors["floor_name"].tolist()
+    structure.model_options = {"n_infill": n_infill, "enable_REZ": False}
+    structure.init_index_groups()
+    return structure
+
+
+def grids_of(structure, uid):
+    return sorted(k for k, uids in structure.index_for.items() if k.startswith("on ") and uid in uids)
+
+
+@pytest.mark.parametrize("n_infill", [0, 1, 3])
+def test_create_frames_matches_nested_loops(sap_model, n_infill):
+    structure = make_structure(n_infill)
+    structure.create_frames(sap_model)
+    
+    # reference: (frame_type, end_coords, grids) per floor in the original loop order
+    x_items, y_items = list(X_GRIDS.items()), list(Y_GRIDS.items())
+    expected = []
+    for floor in structure.df_floors.itertuples():
+        zc = floor.floor_elev * 12
+        zb = zc - floor.floor_height * 12
+        for ygrid, x in y_items:
+            for xgrid, y in x_items:
+                expected.append(("column", [(x, y, zb), (x, y, zc)], sorted([f"on {xgrid}", f"on {ygrid}"])))
+        for xgrid, y in x_items:
+            for j in range(len(y_items)-1):
+                expected.append(("girder", [(y_items[j][1], y, zc), (y_items[j+1][1], y, zc)], [f"on {xgrid}"]))
+        for ygrid, x in y_items:
+            for j in range(len(x_items)-1):
+                expected.append(("beam", [(x, x_items[j][1], zc), (x, x_items[j+1][1], zc)], [f"on {ygrid}"]))
+        for i in range(len(y_items)-1):
+            for j in range(len(x_items)-1):
+                for k in range(n_infill):
+                    x_left, x_right = y_items[i][1], y_items[i+1][1]
+                    x = x_left + (k+1)*(x_right - x_left) / (n_infill+1)
+                    expected.append(("beam", [(x, x_items[j][1], zc), (x, x_items[j+1][1], zc)], []))
+    
+    uids = structure.index_for["ROOF"] + structure.index_for["L2"]
+    actual = []
+    for uid in uids:
+        frame = structure.frame_objects[uid]
+        actual.append((frame.frame_type, [tuple(c) for c in frame.end_coords], grids_of(structure, uid)))
+    assert actual == expected
+    assert len(structure.index_for["column"]) == 2 * len(X_GRIDS) * len(Y_GRIDS)
+
+
+# reference brace ends per bay segment (start, end, mid) as (ordinate, z) pairs
+BRACE_REFERENCE = {
+    "_add_braces_singleA": lambda s, e, m, zc, zb: [((s, zb), (e, zc))],
+    "_add_braces_singleB": lambda s, e, m, zc, zb: [((e, zb), (s, zc))],
+    "_add_braces_V":       lambda s, e, m, zc, zb: [((s, zc), (m, zb)), ((m, zb), (e, zc))],
+    "_add_braces_chevron": lambda s, e, m, zc, zb: [((s, zb), (m, zc)), ((m, zc), (e, zb))],
+    "_add_braces_X":       lambda s, e, m, zc, zb: [((s, zb), (m, (zc+zb)/2)), ((m, (zc+zb)/2), (e, zc)),
+                                                    ((s, zc), (m, (zc+zb)/2)), ((m, (zc+zb)/2), (e, zb))],
+}
+
+
+@pytest.mark.parametrize("direction", ["X", "Y"])
+@pytest.mark.parametrize("helper", sorted(BRACE_REFERENCE))
+def test_brace_helpers_match_reference(sap_model, helper, direction):
+    structure = make_structure()
+    abscissa, ordinate_range, zc, zb = 300.0, [0.0, 240.0, 480.0], 312.0, 168.0
+    getattr(structure, helper)(sap_model, "ROOF", direction, abscissa, ordinate_range, "HSS6X6X1/2", zc, zb, "2")
+    
+    def point(ordinate, z):
+        return (ordinate, abscissa, z) if direction == "X" else (abscissa, ordinate, z)
+    
+    expected = []
+    for s, e in zip(ordinate_range[:-1], ordinate_range[1:]):
+        for (o_i, z_i), (o_j, z_j) in BRACE_REFERENCE[helper](s, e, (s+e)/2, zc, zb):
+            expected.append((point(o_i, z_i), point(o_j, z_j)))
+    assert sap_model.added_frames() == expected
+    
+    n = len(expected)
+    for group in ("ROOF", "on 2", "SFRS", f"SFRS_brace{direction}"):
+        assert len(structure.index_for[group]) == n
+
+
+def test_parse_sfrs_bays_matches_string_parsing():
+    structure = make_structure()
+    structure.df_SFRSbays = pd.DataFrame({"floor_name": ["ROOF", "L2"],
+                                          "bay_1": ["1;A-C", "B;3-1"],
+                                          "bay_2": [None, "3;D-B"]})
+    sfrs_bays = structure._parse_sfrs_bays()
+    
+    for row, floor_bays in zip(structure.df_SFRSbays.iloc[:, 1:].itertuples(index=False), sfrs_bays):
+        labels = [label for label in row if not pd.isna(label)]
+        assert [bay.label for bay in floor_bays] == labels
+        for bay, label in zip(floor_bays, labels):
+            # reference: the original per-bay parsing
+            grid_on, grid_fromto = label.split(";")
+            start, end = grid_fromto.split("-")
+            if grid_on in X_GRIDS:
+                direction, abscissa = "X", X_GRIDS[grid_on]
+                lo, hi = sorted((start, end))
+                ordinate_range = [Y_GRIDS[chr(c)] for c in range(ord(lo), ord(hi)+1)]
+                ordinates = [Y_GRIDS[start], Y_GRIDS[end]]
+            else:
+                direction, abscissa = "Y", Y_GRIDS[grid_on]
+                lo, hi = sorted((int(start), int(end)))
+                ordinate_range = [X_GRIDS[str(c)] for c in range(lo, hi+1)]
+                ordinates = [X_GRIDS[start], X_GRIDS[end]]
+            assert (bay.grid_on, bay.grid_from, bay.grid_to) == (grid_on, start, end)
+            assert (bay.direction, bay.abscissa) == (direction, abscissa)
+            assert (bay.ordinate_from, bay.ordinate_to) == (min(ordinates), max(ordinates))
+            assert bay.ordinate_range == ordinate_range
+
+
+@pytest.mark.parametrize("vertices", [
+    [(0, 0), (840, 0), (840, 660), (0, 660)],                               # rectangle on the grid extents
+    [(0, 0), (840, 0), (840, 300), (240, 300), (240, 660), (0, 660)],       # L-shape
+    [(0, 0), (840, 0), (840, 659), (839, 659), (839, 660), (0, 660)],       # 1x1 corner notch: same bbox, near same area
+    [(0, 0), (480, 0), (480, 660), (0, 660)],                               # rectangle short of the grids
+])
+def test_delete_frames_matches_per_member_covers(sap_model, vertices):
+    structure = make_structure(n_infill=1)
+    structure.create_frames(sap_model)
+    structure.floor_objects = dict()
+    for floor_name in structure.floor_names:
+        floor_obj = modelgenerator.Floor(floor_name, "RIGID", 0, vertices, 0, 0, "Slab")
+        floor_obj.polygon = shapely.Polygon(vertices)
+        structure.floor_objects[floor_name] = floor_obj
+    
+    # reference: each member tested on its own against its floor polygon
+    expected_deleted = []
+    for floor_name in structure.floor_names:
+        polygon = structure.floor_objects[floor_name].polygon
+        for uid in structure.index_for[floor_name]:
+            frame = structure.frame_objects[uid]
+            if not polygon.covers(shapely.LineString([frame._i[:2], frame._j[:2]])):
+                expected_deleted.append(uid)
+    expected_remaining = {category: [uid for uid in structure.index_for[category] if uid not in expected_deleted]
+                          for category in ("column", "girder", "beam")}
+    
+    structure.delete_frames(sap_model)
+    assert structure.index_for["deleted"] == expected_deleted
+    for category, uids in expected_remaining.items():
+        assert structure.index_for[category] == uids
+    assert all(structure.frame_objects[uid].deleted for uid in expected_deleted)
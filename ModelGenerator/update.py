@@ -1,118 +1,161 @@
 import os
+import json
+import logging
 import sys
 import time
 import pickle
+from collections import defaultdict
 import pandas as pd
 import xlwings as xw
+from python_calamine import CalamineWorkbook
 import comtypes.client
 import modelgenerator
+from modelgenerator.sapmodel import _ok
+from modelgenerator.sheet import cell_block, filled_table, grid_ordinates
+
+logger = logging.getLogger(__name__)
 
 CURRENT_WORKING_FOLDER = os.path.dirname(os.path.dirname(__file__))
 INPUT_SHEET_NAME = "Input"
 XLSX_FILE_NAME = "ETABS Model Generator.xlsm"
+INPUT_RANGE = "C8:AE79"     # smallest block covering every input table update.py reads. Read with one COM call
+STATE_FILE_NAME = "ModelGeneratorState.json"      # sections applied by the last update. Rewritten every update
+_loaded_structures = dict()     # saved model path --> (modified time, Structure). Reused when main() is run again in one session
+FLOOR_DTYPES = {"floor_name": "string", "floor_height": "float64", "floor_elev": "float64", "SD_load": "float64",
+                "live_load": "float64", "cladding_load": "float64", "slab": "string", "girder": "string",
+                "beam": "string", "column": "string"}
 
 
 def main():
-    # connect to workbook with xlwings
     file_path = os.path.join(CURRENT_WORKING_FOLDER, XLSX_FILE_NAME)
-    workbook = xw.Book(file_path)
-    input_sheet = workbook.sheets[INPUT_SHEET_NAME]
-
-    # read user inputs
     print("Reading user inputs...")
-    df_floors, x_grids, y_grids, df_SFRSbays, df_MF, df_braces, df_walls, model_options = read_user_input(input_sheet)
+    if not workbook_is_open(file_path):
+        # workbook is closed, so the saved file is current. Read it straight from disk without starting Excel
+        df_floors, x_grids, y_grids, df_SFRSbays, df_MF, df_braces, df_walls, model_options = read_user_input_fast(file_path)
+    else:
+        # workbook is open in Excel and may have unsaved edits. Read the live values with xlwings.
+        # Excel repaint, recalculation and alerts are off while reading and restored afterwards
+        workbook = xw.Book(file_path)
+        input_sheet = workbook.sheets[INPUT_SHEET_NAME]
+        app = workbook.app
+        screen_updating, calculation, display_alerts = app.screen_updating, app.calculation, app.display_alerts
+        app.screen_updating = False
+        app.calculation = "manual"
+        app.display_alerts = False
+        try:
+            df_floors, x_grids, y_grids, df_SFRSbays, df_MF, df_braces, df_walls, model_options = read_user_input(input_sheet)
+        finally:
+            app.screen_updating = screen_updating
+            app.calculation = calculation
+            app.display_alerts = display_alerts
     
     # connect to ETABS API
     start_time = time.time()
     SapModel, ETABSObject = ETABS_API_connect()
     SapModel.SetPresentUnits(3) #kip.in
     
-    # unpickle Structure from previous runs
-    print("Loading ModelGeneratorData.pkl from previous run...")
-    pkl_filepath = os.path.join(CURRENT_WORKING_FOLDER, "ModelGeneratorData.pkl")
-    if not os.path.exists(pkl_filepath):
-        raise RuntimeError("Could not find ModelGeneratorData.pkl. Did you generate a model previously?")
-    with open(pkl_filepath, 'rb') as file:
-        Structure = pickle.load(file)
+    # load index groups saved by run.py, and the sections applied by the last update (if any)
+    Structure = load_structure(CURRENT_WORKING_FOLDER)
+    state_filepath = os.path.join(CURRENT_WORKING_FOLDER, STATE_FILE_NAME)
+    if os.path.exists(state_filepath):
+        with open(state_filepath, "r") as file:
+            last_applied = {floor_name: sections for floor_name, sections in json.load(file)["last_applied"]}
+    else:
+        last_applied = dict()
     
     # logic to update section sizes
-    index_for = Structure.index_for
-    index_for_walls = Structure.index_for_walls
+    # index groups are only read from here on. Frozen once so each floor/category intersection below is a plain
+    # set operation instead of building two new sets from lists every time
+    index_for = defaultdict(frozenset, {k: frozenset(v) for k, v in Structure.index_for.items()})
+    index_for_walls = defaultdict(frozenset, {k: frozenset(v) for k, v in Structure.index_for_walls.items()})
     floor_names = Structure.floor_names
     
-    print("Updating section size...")
-    for i,floor in enumerate(floor_names):
-        gravity_beam = df_floors.loc[i, "beam"]
-        gravity_girder = df_floors.loc[i, "girder"]
-        gravity_col = df_floors.loc[i, "column"]
-        
-        # gravity col
-        relevant_members = set(index_for[floor]) & set(index_for["column"])
-        for uid in relevant_members:
-            SapModel.FrameObj.SetSection(Name=uid, PropName=gravity_col)
-        
-        # gravity girder
-        relevant_members = set(index_for[floor]) & set(index_for["girder"])
-        for uid in relevant_members:
-            SapModel.FrameObj.SetSection(Name=uid, PropName=gravity_girder)
-            
-        # infill beams
-        relevant_members = set(index_for[floor]) & set(index_for["beam"])
-        for uid in relevant_members:
-            SapModel.FrameObj.SetSection(Name=uid, PropName=gravity_beam)
-        
+    # unlock once for the whole update and hide the ETABS window so section changes are not redrawn one by one.
+    # the window always comes back, even if the update fails part way through
+    SapModel.SetModelIsLocked(False)
+    ETABSObject.Hide()
+    try:
+        print("Updating section size...")
+        # section columns pulled out once as plain lists indexed by floor, instead of a .loc lookup per cell.
+        # each category is paired with its index group up front, so the floor loop below only intersects
+        # the floor's set with sets that were looked up once. Frame categories are in the order sections apply
+        N_floors = len(floor_names)
+        frame_plan = [("column", column_by_floor(df_floors, "column", N_floors)),   # gravity col
+                      ("girder", column_by_floor(df_floors, "girder", N_floors)),   # gravity girder
+                      ("beam",   column_by_floor(df_floors, "beam", N_floors))]     # infill beams
         if df_MF is not None:
-            MF_colX = df_MF.loc[i,"x_column"]
-            MF_colY = df_MF.loc[i,"y_column"]
-            MF_bmX = df_MF.loc[i,"x_beam"]
-            MF_bmY = df_MF.loc[i,"y_beam"]
-            # SFRS MF beamX
-            relevant_members = set(index_for[floor]) & set(index_for["SFRS_beamX"])
-            for uid in relevant_members:
-                SapModel.FrameObj.SetSection(Name=uid, PropName=MF_bmX)
-                
-            # SFRS MF beamY
-            relevant_members = set(index_for[floor]) & set(index_for["SFRS_beamY"])
-            for uid in relevant_members:
-                SapModel.FrameObj.SetSection(Name=uid, PropName=MF_bmY)
-            
-            # SFRS MF colX
-            relevant_members = set(index_for[floor]) & set(index_for["SFRS_columnX"])
-            for uid in relevant_members:
-                SapModel.FrameObj.SetSection(Name=uid, PropName=MF_colX)
-            
-            # SFRS MF colY
-            relevant_members = set(index_for[floor]) & set(index_for["SFRS_columnY"])
-            for uid in relevant_members:
-                SapModel.FrameObj.SetSection(Name=uid, PropName=MF_colY)
-        
+            frame_plan += [("SFRS_beamX",   column_by_floor(df_MF, "x_beam", N_floors)),
+                           ("SFRS_beamY",   column_by_floor(df_MF, "y_beam", N_floors)),
+                           ("SFRS_columnX", column_by_floor(df_MF, "x_column", N_floors)),
+                           ("SFRS_columnY", column_by_floor(df_MF, "y_column", N_floors))]
         if df_braces is not None:
-            braceX = df_braces.loc[i,"x_brace"]
-            braceY = df_braces.loc[i,"y_brace"]
-            # SFRS braceX
-            relevant_members = set(index_for[floor]) & set(index_for["SFRS_braceX"])
-            for uid in relevant_members:
-                SapModel.FrameObj.SetSection(Name=uid, PropName=braceX)
-                
-            # SFRS braceY
-            relevant_members = set(index_for[floor]) & set(index_for["SFRS_braceY"])
-            for uid in relevant_members:
-                SapModel.FrameObj.SetSection(Name=uid, PropName=braceY)
-                
+            frame_plan += [("SFRS_braceX", column_by_floor(df_braces, "x_brace", N_floors)),
+                           ("SFRS_braceY", column_by_floor(df_braces, "y_brace", N_floors))]
+        frame_plan = [(category, index_for[category], sections) for category, sections in frame_plan]
+        wall_plan = []
         if df_walls is not None:
-            wallX = df_walls.loc[i,"x_wall"]
-            wallY = df_walls.loc[i,"y_wall"]
-            # SFRS wallX
-            relevant_members = set(index_for_walls[floor]) & set(index_for_walls["SFRS_wallX"])
-            for uid in relevant_members:
-                SapModel.AreaObj.SetProperty(Name=uid, PropName=wallX)
-                
-            # SFRS wallY
-            relevant_members = set(index_for_walls[floor]) & set(index_for_walls["SFRS_wallY"])
-            for uid in relevant_members:
-                SapModel.AreaObj.SetProperty(Name=uid, PropName=wallY)
+            wall_plan += [("SFRS_wallX", index_for_walls["SFRS_wallX"], column_by_floor(df_walls, "x_wall", N_floors)),
+                          ("SFRS_wallY", index_for_walls["SFRS_wallY"], column_by_floor(df_walls, "y_wall", N_floors))]
+        
+        # each (floor, category) is resized with one SetSection/SetProperty call on its group (ItemType=1 is Group).
+        # groups are made by Structure.set_groups(); models generated before that get them built here on first update.
+        # a frame keeps the last section applied to it (SFRS after gravity) and blank cells leave frames as is
+        N_groups, group_names, ret = SapModel.GroupDef.GetNameList()
+        existing_groups = set(group_names or ())
+        applied = dict()
+        # frames and walls go through the same loop. API methods are bound once here instead of per call
+        set_group = SapModel.GroupDef.SetGroup_1
+        object_plans = [(frame_plan, index_for,       SapModel.FrameObj.SetGroupAssign, SapModel.FrameObj.SetSection),
+                        (wall_plan,  index_for_walls, SapModel.AreaObj.SetGroupAssign,  SapModel.AreaObj.SetProperty)]
+        assignments = list()
+        for i,floor in enumerate(floor_names):
+            # floors whose sections all match the last update are left alone. Any change re-applies the whole
+            # floor in order, so SFRS sections still land after the gravity sections they overlap
+            floor_sections = {category: None if pd.isna(sections[i]) else sections[i]
+                              for category, _, sections in frame_plan + wall_plan}
+            applied[floor] = floor_sections
+            if last_applied.get(floor) == floor_sections:
+                continue
             
-    SapModel.View.RefreshView(Zoom=False)
+            for plan, index, assign, set_section in object_plans:
+                floor_members = index[floor]
+                for category, category_members, _ in plan:
+                    section = floor_sections[category]
+                    if section is None:
+                        continue
+                    group = modelgenerator.Structure.section_group(floor, category)
+                    if group not in existing_groups:
+                        members = floor_members & category_members
+                        if len(members) == 0:
+                            continue
+                        ret = set_group(group)
+                        for uid in members:
+                            ret = assign(Name=uid, GroupName=group)
+                        existing_groups.add(group)
+                    assignments.append((floor, set_section, group, section))
+        
+        # every section change in apply order, issued in one flat loop. A floor only counts as applied if all of its
+        # calls went through; failed floors keep their old record (or none) so the next update tries them again
+        failed_floors = set()
+        for floor, set_section, group, section in assignments:
+            ret = set_section(Name=group, PropName=section, ItemType=1)
+            if not _ok(ret):
+                logger.warning("could not apply section %s to group: %s", section, group)
+                failed_floors.add(floor)
+        for floor in failed_floors:
+            if floor in last_applied:
+                applied[floor] = last_applied[floor]
+            else:
+                del applied[floor]
+    finally:
+        ETABSObject.Unhide()
+        SapModel.View.RefreshView(Zoom=False)
+    
+    # remember what was applied so the next update only touches floors that changed. Only this small state file is
+    # written; the model topology saved by run.py does not change here
+    with open(state_filepath, "w") as file:
+        json.dump({"last_applied": [[k, v] for k, v in applied.items()]}, file)
+    
     end_time = time.time()
     print("Done!")
     print("Total elapsed time: {:.2f} seconds".format(end_time - start_time))
@@ -121,63 +164,122 @@ def main():
 
 
 
+def load_structure(folder):
+    """
+    Load the Structure saved by run.py. The loaded Structure is kept and handed back as long as the file on disk has
+    not changed since it was read
+    """
+    filepath = os.path.join(folder, "ModelGeneratorData.json")
+    if not os.path.exists(filepath):
+        pkl_filepath = os.path.join(folder, "ModelGeneratorData.pkl")
+        if not os.path.exists(pkl_filepath):
+            raise RuntimeError("Could not find ModelGeneratorData.json. Did you generate a model previously?")
+        migrate_pickle(pkl_filepath, filepath)
+    
+    modified = os.path.getmtime(filepath)
+    if filepath in _loaded_structures and _loaded_structures[filepath][0] == modified:
+        return _loaded_structures[filepath][1]
+    
+    print("Loading ModelGeneratorData.json from previous run...")
+    with open(filepath, "r") as file:
+        Structure = modelgenerator.Structure.from_dict(json.load(file))
+    _loaded_structures[filepath] = (modified, Structure)
+    return Structure
+
+
+
+def migrate_pickle(pkl_filepath, json_filepath):
+    """
+    One-time conversion of ModelGeneratorData.pkl, written by versions before the JSON format, to
+    ModelGeneratorData.json. Later updates only read the JSON file
+    """
+    logger.warning("converting %s from an older version to %s once. If it was not generated for the model open in "
+                   "ETABS, delete both files and run run.py again", pkl_filepath, json_filepath)
+    with open(pkl_filepath, "rb") as file:
+        Structure = pickle.load(file)
+    with open(json_filepath, "w") as file:
+        json.dump(Structure.to_dict(), file)
+
+
+
+def column_by_floor(df, col, N_floors):
+    """
+    Values of df[col] as a plain list, one per floor from roof to base. Rows dropped as blank read as NaN
+    """
+    return df[col].reindex(range(N_floors)).tolist()
+
+
+
+def workbook_is_open(file_path):
+    """
+    True if a running Excel instance has the workbook open. Asks Excel itself rather than looking for a "~$" owner
+    file, which can be stale after a crash or missing on network shares. Matched by file name, since Excel cannot
+    open two workbooks with the same name and book paths on synced folders come back as URLs
+    """
+    name = os.path.basename(file_path).lower()
+    return any(book.name.lower() == name for app in xw.apps for book in app.books)
+
+
+
+def read_user_input_fast(file_path):
+    """
+    Same as read_user_input() but reads the saved workbook from disk with python-calamine (Rust parser) instead of a
+    live Excel sheet. Gives the values Excel last calculated
+    """
+    # calamine hands back the whole sheet from A1 with empty cells as "". Blank them to None like xlwings does
+    sheet = CalamineWorkbook.from_path(file_path).get_sheet_by_name(INPUT_SHEET_NAME)
+    block = cell_block(sheet.to_python(skip_empty_area=False), INPUT_RANGE, "A1")
+    raw = [[None if v == "" else v for v in row] for row in block]
+    return parse_user_input(raw)
+
+
+
 def read_user_input(sheet):
     """
     Reads the ETABS model generator spreadsheet and return in either dataframe or dict format
     """
+    # every table comes out of one block read, then gets sliced in parse_user_input()
+    return parse_user_input(sheet.range(INPUT_RANGE).value)
+
+
+
+def parse_user_input(raw):
+    """
+    Slice the input tables out of raw, the 2D list of cell values in INPUT_RANGE
+    """
     # floor elevation
     headers = ["floor_name", "floor_height", "floor_elev", "SD_load", "live_load", "cladding_load", "floor_polygon","na","na","na","na", "slab", "girder", "beam", "column"]
-    df_floors = pd.DataFrame(sheet.range("C8:Q32").value, columns = headers)
-    df_floors = df_floors.dropna(subset=["floor_name"])
-    df_floors = df_floors.dropna(axis=1, how = "all")
-    df_floors.reset_index(drop=True)
+    df_floors = filled_table(cell_block(raw, "C8:Q32", INPUT_RANGE), headers, drop_empty_columns=True)
+    # typed columns instead of object. Only the ones left after blank columns are dropped
+    df_floors = df_floors.astype({k: v for k, v in FLOOR_DTYPES.items() if k in df_floors.columns})
     
     # grid system
-    xgrid_name = list(sheet.range("T8:T32").value)
-    xgrid_ordinate = list(sheet.range("U8:U32").value)
-    x_grids = {str(k):v*12 for k,v in zip(xgrid_name, xgrid_ordinate) if not pd.isna(v)}
-    
-    ygrid_name = list(sheet.range("V8:V32").value)
-    ygrid_ordinate = list(sheet.range("W8:W32").value)
-    y_grids = {str(k):v*12 for k,v in zip(ygrid_name, ygrid_ordinate) if not pd.isna(v)}
+    x_grids = grid_ordinates(cell_block(raw, "T8:U32", INPUT_RANGE))
+    y_grids = grid_ordinates(cell_block(raw, "V8:W32", INPUT_RANGE))
     
     # SFRS bays
     headers = ["floor_name", "bay_1", "bay_2", "bay_3", "bay_4", "bay_5", "bay_6", "bay_7", "bay_8", "bay_9", "bay_10", "bay_11", "bay_12", "bay_13", "bay_14", "bay_15"]
-    df_SFRSbays = pd.DataFrame(sheet.range("C38:R73").value, columns = headers)
-    df_SFRSbays = df_SFRSbays.dropna(subset=["floor_name"])
-    df_SFRSbays = df_SFRSbays.dropna(axis=1, how = "all")
-    df_SFRSbays.reset_index(drop=True)
+    df_SFRSbays = filled_table(cell_block(raw, "C38:R73", INPUT_RANGE), headers, drop_empty_columns=True)
     
-    # moment frame members
+    # moment frame members. The first column is the X section, so a floor with only Y members still has a row
     headers = ["x_column", "x_beam", "y_column", "y_beam"]
-    df_MF = pd.DataFrame(sheet.range("T38:W73").value, columns = headers)
-    df_MF = df_MF.dropna(subset=["x_column"])
-    df_MF.reset_index(drop=True)
-    if len(df_MF)==0:
-        df_MF = None
+    df_MF = filled_table(cell_block(raw, "T38:W73", INPUT_RANGE), headers, any_cell=True)
         
     # brace members
     headers = ["x_brace", "x_config", "y_brace", "y_config"]
-    df_braces = pd.DataFrame(sheet.range("Y38:AB73").value, columns = headers)
-    df_braces = df_braces.dropna(subset=["x_brace"])
-    df_braces.reset_index(drop=True)
-    if len(df_braces)==0:
-        df_braces = None
+    df_braces = filled_table(cell_block(raw, "Y38:AB73", INPUT_RANGE), headers, any_cell=True)
     
     # wall members
     headers = ["x_wall", "y_wall"]
-    df_walls = pd.DataFrame(sheet.range("AD38:AE73").value, columns = headers)
-    df_walls = df_walls.dropna(subset=["x_wall"])
-    df_walls.reset_index(drop=True)
-    if len(df_walls)==0:
-        df_walls = None
+    df_walls = filled_table(cell_block(raw, "AD38:AE73", INPUT_RANGE), headers, any_cell=True)
     
     # other model options
+    [diaphragm_type], [base_fixity], [enable_REZ], [n_infill] = cell_block(raw, "F76:F79", INPUT_RANGE)
     model_options = dict()
-    model_options["diaphragm_type"] = sheet.range('F76').value
-    model_options["base_fixity"] = sheet.range('F77').value
-    model_options["enable_REZ"] = sheet.range('F78').value
-    model_options["n_infill"] = int(sheet.range('F79').value)
+    model_options["diaphragm_type"] = diaphragm_type
+    model_options["base_fixity"] = base_fixity
+    model_options["enable_REZ"] = enable_REZ
+    model_options["n_infill"] = int(n_infill)
     
     return df_floors, x_grids, y_grids, df_SFRSbays, df_MF, df_braces, df_walls, model_options
 
@@ -195,12 +297,13 @@ def ETABS_API_connect():
     except (OSError, comtypes.COMError):
         print("No running instance of the program found or failed to attach.")
         sys.exit(-1)
-    SapModel = myETABSObject.SapModel
+    SapModel = modelgenerator.SapModelCache(myETABSObject.SapModel)
     return SapModel, myETABSObject
 
 
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(levelname)s: %(message)s")
     print("##################################################################################")
     print(r"""
   __  __           _      _  _____                           _             